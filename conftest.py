@@ -0,0 +1,97 @@
+"""Shared pytest fixtures"""
+
+import asyncio
+import logging
+import os
+import sys
+from logging.handlers import MemoryHandler
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+
+if uvloop is not None:
+    @pytest.fixture(scope="session")
+    def event_loop_policy():
+        """Run async tests on uvloop's libuv-based loop where it is installed"""
+        return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def eager_tasks():
+    """Start tasks on the session loop eagerly (Python 3.12+)
+
+    Coroutines that finish without suspending, such as cache hits, complete
+    inside create_task instead of waiting for a scheduling round-trip.
+    """
+    if not hasattr(asyncio, "eager_task_factory"):
+        yield
+        return
+    loop = asyncio.get_running_loop()
+    previous = loop.get_task_factory()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    yield
+    loop.set_task_factory(previous)
+
+
+@pytest.fixture(autouse=True)
+def buffered_module_logger(request):
+    """Buffer a test module's `logger` output and write it out once per test
+
+    Status lines collect in a MemoryHandler instead of each taking the
+    stdout lock; closing the handler at teardown flushes them in one go.
+    """
+    logger = getattr(request.module, "logger", None)
+    if not isinstance(logger, logging.Logger):
+        yield
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    handler = MemoryHandler(capacity=1000, target=stream)
+    previous_level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+        handler.close()
+
+
+@pytest.fixture
+def mock_urlopen():
+    """Patch urllib.request.urlopen for the duration of a test"""
+    with patch('urllib.request.urlopen') as m:
+        yield m
+
+
+@pytest.fixture(scope="session")
+def mcp():
+    """Import jules_mcp.server once per session and return its MCP instance
+
+    A placeholder JULES_API_KEY is provided for the session if none is set,
+    so the module-level configuration loads; a real key in the environment is
+    left alone. Tests that need the server take this fixture rather than
+    setting up the environment and importing on their own.
+    """
+    set_here = "JULES_API_KEY" not in os.environ
+    os.environ.setdefault("JULES_API_KEY", "test_key_for_mcp_validation")
+    try:
+        try:
+            from jules_mcp.server import mcp as server_mcp
+        except ImportError as e:
+            pytest.skip(f"jules_mcp.server unavailable: {e}")
+        yield server_mcp
+    finally:
+        if set_here:
+            os.environ.pop("JULES_API_KEY", None)
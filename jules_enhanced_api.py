@@ -9,12 +9,15 @@ import urllib.request
 import json
 import time
 import hashlib
+import math
 import random
 import uuid
 import urllib.parse
 import threading
+import queue
 import logging
-from typing import Dict, Optional, List, Any, Callable, Union
+from collections import deque
+from typing import Dict, Optional, List, Any, Callable, Union, Deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -49,6 +52,19 @@ class ActivityType(Enum):
     ERROR = "ERROR"
     COMPLETION_NOTIFICATION = "COMPLETION_NOTIFICATION"
 
+# Activity fields that identify a change for polling purposes
+ACTIVITY_HASH_FIELDS = ('name', 'type', 'message')
+
+# Queue sentinel telling the notification dispatcher thread to exit
+_STOP_NOTIFICATIONS = object()
+
+# Number of recent response times kept for inspection; averages use running totals
+RESPONSE_TIME_WINDOW = 256
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """Render a time.time_ns() timestamp as an ISO 8601 UTC string"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
 @dataclass
 class ThroughputMetrics:
     """Comprehensive throughput tracking"""
@@ -57,7 +73,11 @@ class ThroughputMetrics:
     failed_requests: int = 0
     bytes_sent: int = 0
     bytes_received: int = 0
-    response_times: List[float] = field(default_factory=list)
+    response_times: Deque[float] = field(default_factory=lambda: deque(maxlen=RESPONSE_TIME_WINDOW))
+    response_time_sum: float = 0.0
+    response_time_count: int = 0
+    # Neumaier compensation term for response_time_sum
+    _response_time_error: float = field(default=0.0, repr=False)
     session_creation_time: Optional[datetime] = None
     session_completion_time: Optional[datetime] = None
     activities_processed: int = 0
@@ -69,7 +89,21 @@ class ThroughputMetrics:
 
     @property
     def average_response_time(self) -> float:
-        return sum(self.response_times) / max(len(self.response_times), 1)
+        return (self.response_time_sum + self._response_time_error) / max(self.response_time_count, 1)
+
+    def record_response_times(self, times: List[float]):
+        """Add response times to the running totals and the recent window"""
+        self.response_times.extend(times)
+        self.response_time_count += len(times)
+
+        # fsum is exact within the batch; compensate the running total across batches
+        batch_sum = math.fsum(times)
+        total = self.response_time_sum + batch_sum
+        if abs(self.response_time_sum) >= abs(batch_sum):
+            self._response_time_error += (self.response_time_sum - total) + batch_sum
+        else:
+            self._response_time_error += (batch_sum - total) + self.response_time_sum
+        self.response_time_sum = total
 
     @property
     def duration_seconds(self) -> Optional[float]:
@@ -99,10 +133,30 @@ class JulesEnhancedAPIClient:
         self.session_cache = {}
         self.activity_cache = {}
         self.active_pollers: Dict[str, Future] = {}
-        self.notification_handlers: List[Callable] = []
-        self.executor = ThreadPoolExecutor(max_workers=10)
+        # Set by stop_session_polling() to end that session's polling loop
+        self._poll_stops: Dict[str, threading.Event] = {}
+        # Keyed by the handler itself: insertion-ordered for dispatch, O(1) removal
+        self.notification_handlers: Dict[Callable, Callable] = {}
+        # Handlers run on one dispatcher thread, started on the first notification
+        self._notify_q: queue.Queue = queue.Queue()
+        self._notify_thread: Optional[threading.Thread] = None
+        self._notify_lock = threading.Lock()
+        # Polling thread pool, created on first use so idle clients spawn no threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Set by shutdown() to end background polling loops promptly
+        self._shutting_down = threading.Event()
         self._setup_logging()
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for background polling, created on first access"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=10)
+        return self._executor
+
     def _setup_logging(self):
         """Setup comprehensive logging for throughput monitoring"""
         if self.config.throughput_logging:
@@ -127,13 +181,35 @@ class JulesEnhancedAPIClient:
             self.metrics.failed_requests += 1
 
         response_time = time.time() - start_time
-        self.metrics.response_times.append(response_time)
+        self.metrics.record_response_times([response_time])
 
         if self.config.throughput_logging:
             logger.info(f"Request completed - Time: {response_time:.3f}s, Success: {success}, "
                        f"Total requests: {self.metrics.total_requests}, "
                        f"Success rate: {self.metrics.success_rate:.2f}%")
 
+    def _log_throughput_batch(self, start_times: List[float], bytes_sent: int, bytes_received: int,
+                              successes: List[bool]):
+        """Log throughput metrics for many requests at once (per-request byte counts)"""
+        n = len(start_times)
+        if not n:
+            return
+        succeeded = sum(successes)
+
+        self.metrics.total_requests += n
+        self.metrics.successful_requests += succeeded
+        self.metrics.failed_requests += n - succeeded
+        self.metrics.bytes_sent += bytes_sent * n
+        self.metrics.bytes_received += bytes_received * n
+
+        now = time.time()
+        self.metrics.record_response_times([now - start for start in start_times])
+
+        if self.config.throughput_logging:
+            logger.info(f"Batch of {n} requests completed - Successes: {succeeded}, "
+                       f"Total requests: {self.metrics.total_requests}, "
+                       f"Success rate: {self.metrics.success_rate:.2f}%")
+
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
                     headers: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request with comprehensive logging"""
@@ -289,18 +365,28 @@ class JulesEnhancedAPIClient:
 
         logger.info(f"Starting session polling for: {session_name}")
 
-        future = self.executor.submit(self._poll_session_until_complete, session_name)
+        stop = self._poll_stops[session_name] = threading.Event()
+        future = self.executor.submit(self._poll_session_until_complete, session_name, stop)
         self.active_pollers[session_name] = future
 
-    def _poll_session_until_complete(self, session_name: str) -> Dict[str, Any]:
+    def _finish_polling(self, session_name: str, stop: threading.Event):
+        """Drop a finished poller's bookkeeping, unless a newer poller has replaced it"""
+        if self._poll_stops.get(session_name) is stop:
+            del self._poll_stops[session_name]
+            self.active_pollers.pop(session_name, None)
+
+    def _poll_session_until_complete(self, session_name: str,
+                                     stop: Optional[threading.Event] = None) -> Dict[str, Any]:
         """Poll session until completion with comprehensive monitoring"""
+        stop = stop or threading.Event()
         start_time = time.time()
         last_activity_count = 0
         last_activity_hash = ""
 
         logger.info(f"Beginning session polling for {session_name}")
 
-        while time.time() - start_time < self.config.max_polling_duration:
+        while (time.time() - start_time < self.config.max_polling_duration
+               and not self._shutting_down.is_set() and not stop.is_set()):
             self.metrics.polling_cycles += 1
 
             # Get session status
@@ -308,7 +394,7 @@ class JulesEnhancedAPIClient:
 
             if session_result['status'] != 'success':
                 logger.error(f"Failed to get session status for {session_name}: {session_result.get('error_message')}")
-                time.sleep(self.config.polling_interval)
+                stop.wait(self.config.polling_interval)
                 continue
 
             session_data = session_result['data']
@@ -318,7 +404,7 @@ class JulesEnhancedAPIClient:
             activities_result = self.get_activities(session_name, page_size=50)
 
             if activities_result['status'] == 'success':
-                activities = activities_result.get('data', [])
+                activities = (activities_result.get('data') or {}).get('activities', [])
                 self.metrics.activities_processed += len(activities)
 
                 # Check for new activities
@@ -327,8 +413,7 @@ class JulesEnhancedAPIClient:
                 if len(activities) != last_activity_count or current_activity_hash != last_activity_hash:
                     new_activities = activities[last_activity_count:]
 
-                    for activity in new_activities:
-                        self._handle_activity_update(session_name, activity)
+                    self._handle_activities_update(session_name, new_activities)
 
                     last_activity_count = len(activities)
                     last_activity_hash = current_activity_hash
@@ -350,19 +435,19 @@ class JulesEnhancedAPIClient:
                 self._notify_completion(session_name, final_result)
 
                 # Clean up polling
-                if session_name in self.active_pollers:
-                    del self.active_pollers[session_name]
+                self._finish_polling(session_name, stop)
 
                 return final_result
 
-            # Wait before next poll
-            time.sleep(self.config.polling_interval)
+            # Wait before next poll (returns early on stop or shutdown)
+            stop.wait(self.config.polling_interval)
 
-        # Polling timeout
-        logger.warning(f"Polling timed out for session: {session_name}")
+        if stop.is_set():
+            logger.info(f"Polling stopped for session: {session_name}")
+        else:
+            logger.warning(f"Polling timed out for session: {session_name}")
 
-        if session_name in self.active_pollers:
-            del self.active_pollers[session_name]
+        self._finish_polling(session_name, stop)
 
         return {
             'session_name': session_name,
@@ -373,23 +458,33 @@ class JulesEnhancedAPIClient:
 
     def _hash_activities(self, activities: List[Dict]) -> str:
         """Create hash of activities for change detection"""
-        activity_str = json.dumps(activities, sort_keys=True, default=str)
-        return hashlib.md5(activity_str.encode()).hexdigest()
+        # Fingerprint only, not a security boundary: feed the identifying fields
+        # straight into a fast hash instead of canonicalizing the whole payload
+        h = hashlib.blake2b(digest_size=8)
+        for activity in activities:
+            for key in ACTIVITY_HASH_FIELDS:
+                h.update(str(activity.get(key, '')).encode())
+                h.update(b'\x1f')
+            h.update(b'\x1e')
+        return h.hexdigest()
 
     def _handle_activity_update(self, session_name: str, activity: Dict):
         """Handle new activity with notification dispatch"""
-        activity_type = activity.get('type', 'UNKNOWN')
-        activity_message = activity.get('message', '')
+        self._handle_activities_update(session_name, [activity])
 
-        logger.info(f"New activity for {session_name}: {activity_type} - {activity_message[:100]}...")
+    def _handle_activities_update(self, session_name: str, activities: List[Dict]):
+        """Handle a batch of new activities with a single notification dispatch"""
+        if not activities:
+            return
+
+        for activity in activities:
+            activity_type = activity.get('type', 'UNKNOWN')
+            activity_message = activity.get('message', '')
+            logger.info(f"New activity for {session_name}: {activity_type} - {activity_message[:100]}...")
 
         # Dispatch to notification handlers
         if self.config.enable_notifications:
-            for handler in self.notification_handlers:
-                try:
-                    handler(session_name, activity)
-                except Exception as e:
-                    logger.error(f"Notification handler failed: {str(e)}")
+            self._dispatch_notification(session_name, activities)
 
     def _notify_completion(self, session_name: str, result: Dict):
         """Notify all handlers of session completion"""
@@ -401,11 +496,46 @@ class JulesEnhancedAPIClient:
             'data': result
         }
 
-        for handler in self.notification_handlers:
+        self._dispatch_notification(session_name, [completion_activity])
+
+    def _dispatch_notification(self, session_name: str, activities: List[Dict]):
+        """Queue a batch of notifications for the dispatcher thread"""
+        if not self.notification_handlers:
+            return
+
+        if self._notify_thread is None:
+            with self._notify_lock:
+                if self._notify_thread is None:
+                    self._notify_thread = threading.Thread(
+                        target=self._notify_loop, name='JulesNotifications', daemon=True
+                    )
+                    self._notify_thread.start()
+
+        self._notify_q.put((session_name, activities))
+
+    def _notify_loop(self):
+        """Run queued notifications through every handler until stopped"""
+        while True:
+            item = self._notify_q.get()
             try:
-                handler(session_name, completion_activity)
-            except Exception as e:
-                logger.error(f"Completion notification handler failed: {str(e)}")
+                if item is _STOP_NOTIFICATIONS:
+                    return
+
+                session_name, activities = item
+                handlers = list(self.notification_handlers.values())
+                for activity in activities:
+                    for handler in handlers:
+                        try:
+                            handler(session_name, activity)
+                        except Exception as e:
+                            logger.error(f"Notification handler failed: {str(e)}")
+            finally:
+                self._notify_q.task_done()
+
+    def flush_notifications(self):
+        """Block until every queued notification has been handled"""
+        if self._notify_thread is not None:
+            self._notify_q.join()
 
     def get_activities(self, session_name: str, page_size: int = 50, page_token: str = None) -> Dict[str, Any]:
         """Get activities with pagination support"""
@@ -451,17 +581,19 @@ class JulesEnhancedAPIClient:
 
     def add_notification_handler(self, handler: Callable[[str, Dict], None]):
         """Add a notification handler for activity updates"""
-        self.notification_handlers.append(handler)
+        self.notification_handlers[handler] = handler
         logger.info(f"Added notification handler (total: {len(self.notification_handlers)})")
 
     def remove_notification_handler(self, handler: Callable[[str, Dict], None]):
         """Remove a notification handler"""
-        if handler in self.notification_handlers:
-            self.notification_handlers.remove(handler)
+        if self.notification_handlers.pop(handler, None) is not None:
             logger.info(f"Removed notification handler (total: {len(self.notification_handlers)})")
 
     def stop_session_polling(self, session_name: str):
         """Stop polling for a specific session"""
+        stop = self._poll_stops.pop(session_name, None)
+        if stop is not None:
+            stop.set()
         if session_name in self.active_pollers:
             future = self.active_pollers[session_name]
             future.cancel()
@@ -533,13 +665,22 @@ Active Polling Sessions: {len(self.active_pollers)}
     def shutdown(self):
         """Graceful shutdown of the client"""
         logger.info("Shutting down Jules Enhanced API Client")
+        self._shutting_down.set()
 
         # Cancel all active polling
         for session_name in list(self.active_pollers.keys()):
             self.stop_session_polling(session_name)
 
-        # Shutdown thread pool
-        self.executor.shutdown(wait=True)
+        # Shutdown thread pool, if polling ever started one
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        # Deliver outstanding notifications, then stop the dispatcher
+        if self._notify_thread is not None:
+            self._notify_q.put(_STOP_NOTIFICATIONS)
+            self._notify_thread.join()
+            self._notify_thread = None
 
         logger.info("Shutdown complete")
 
@@ -609,6 +750,7 @@ class JulesEnhancedWorkflowManager:
             session_data = result['data']
             session_key = session_data.get('name', session_id)
 
+            created_at_ns = time.time_ns()
             self.active_sessions[session_key] = {
                 'session_data': session_data,
                 'branch_name': branch_name,
@@ -616,7 +758,8 @@ class JulesEnhancedWorkflowManager:
                 'source': source,
                 'github_branch': github_branch,
                 'title': title,
-                'created_at': datetime.now(timezone.utc).isoformat(),
+                'created_at_ns': created_at_ns,
+                'created_at': format_timestamp_ns(created_at_ns),
                 'metrics_start': ThroughputMetrics()
             }
 
@@ -641,31 +784,62 @@ class JulesEnhancedWorkflowManager:
         """Wait for specific activity type with timeout and comprehensive logging"""
         start_time = time.time()
         timeout_seconds = timeout_minutes * 60
+        deadline = start_time + timeout_seconds
 
         logger.info(f"Waiting for activity '{activity_type}' on session '{session_name}' "
                    f"(timeout: {timeout_minutes} minutes)")
 
-        while time.time() - start_time < timeout_seconds:
-            activities_result = self.client.get_activities(session_name)
+        found: Dict[str, Dict] = {}
+        arrived = threading.Event()
+        started_polling = False
 
-            if activities_result['status'] == 'success':
-                activities = activities_result.get('data', [])
+        def on_activity(name: str, activity: Dict):
+            if name == session_name and activity.get('type') == activity_type:
+                found.setdefault('activity', activity)
+                arrived.set()
 
+        # Register before the initial sync so an activity arriving in between is not missed
+        self.client.add_notification_handler(on_activity)
+        try:
+            while True:
+                activities = self._fetch_activity_list(session_name)
                 for activity in activities:
                     if activity.get('type') == activity_type:
-                        duration = time.time() - start_time
-                        logger.info(f"Activity '{activity_type}' found after {duration:.1f} seconds")
+                        found.setdefault('activity', activity)
+                        arrived.set()
+                        break
+
+                remaining = deadline - time.time()
+                if arrived.is_set() or remaining <= 0:
+                    break
+
+                if self.client.config.enable_notifications:
+                    # Background polling feeds on_activity; sleep until it fires
+                    if session_name not in self.client.active_pollers:
+                        self.client._start_session_polling(session_name)
+                        started_polling = True
+                    arrived.wait(timeout=remaining)
+                    break
+
+                # Notifications disabled: re-sync on the polling interval instead
+                arrived.wait(timeout=min(self.client.config.polling_interval, remaining))
+        finally:
+            self.client.remove_notification_handler(on_activity)
+            # A one-off wait must not leave its own poller running
+            if started_polling:
+                self.client.stop_session_polling(session_name)
 
-                        return {
-                            'status': 'success',
-                            'activity': activity,
-                            'found_at': duration,
-                            'activities_checked': len(activities)
-                        }
+        duration = time.time() - start_time
 
-            time.sleep(3)  # Check every 3 seconds
+        if arrived.is_set():
+            logger.info(f"Activity '{activity_type}' found after {duration:.1f} seconds")
+            return {
+                'status': 'success',
+                'activity': found['activity'],
+                'found_at': duration,
+                'activities_checked': len(activities)
+            }
 
-        duration = time.time() - start_time
         logger.warning(f"Activity '{activity_type}' not found within {timeout_minutes} minutes "
                       f"(searched for {duration:.1f} seconds)")
 
@@ -675,6 +849,13 @@ class JulesEnhancedWorkflowManager:
             'search_duration': duration
         }
 
+    def _fetch_activity_list(self, session_name: str) -> List[Dict]:
+        """Fetch the session's current activities, or an empty list on error"""
+        activities_result = self.client.get_activities(session_name)
+        if activities_result['status'] != 'success':
+            return []
+        return (activities_result.get('data') or {}).get('activities', [])
+
 # === EXAMPLE USAGE ===
 
 def create_slack_notification_handler(webhook_url: str) -> Callable:
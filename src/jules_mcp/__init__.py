@@ -3,12 +3,14 @@
 __version__ = "0.1.0"
 
 from .jules_client import JulesAPIClient
-from .worker_manager import WorkerManager
+from .worker_manager import WorkerManager, WorkerNotFoundError, BulkCreateError
 from .state import WorkerState, WorkerSession, Activity, ActivityType
 
 __all__ = [
     "JulesAPIClient",
     "WorkerManager",
+    "WorkerNotFoundError",
+    "BulkCreateError",
     "WorkerState",
     "WorkerSession",
     "Activity",
@@ -21,16 +21,25 @@ class JulesAPIClient:
         """
         self.api_key = api_key
         self.base_url = f"{base_url}/{api_version}"
-
-        # Create async HTTP client
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={
-                "X-Goog-Api-Key": api_key,
-                "Content-Type": "application/json"
-            },
-            timeout=60.0
-        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for every request, created on first use"""
+        if self._client is None:
+            # A single pooled client is shared by all requests so concurrent
+            # polls multiplex over kept-alive HTTP/2 connections
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "X-Goog-Api-Key": self.api_key,
+                    "Content-Type": "application/json"
+                },
+                timeout=60.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=128)
+            )
+        return self._client
 
     async def create_session(
         self,
@@ -212,4 +221,6 @@ class JulesAPIClient:
 
     async def close(self) -> None:
         """Close the HTTP client and cleanup connections"""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
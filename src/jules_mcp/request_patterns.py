@@ -13,7 +13,11 @@ import time
 import re
 import asyncio
 import logging
+import ssl
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Callable
+
+import httpx
 from dataclasses import dataclass
 from collections import defaultdict
 import random
@@ -36,6 +40,22 @@ class APIResponse:
             self.timestamp = time.time()
 
 
+# One DuckDuckGo HTML result link: captures (href, title markup)
+_RESULT_RE = re.compile(r'<a rel="nofollow" class="result__a" href="([^"]+)"[^>]*>(.*?)</a>')
+
+
+@lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """TLS context shared by every client; loading the CA bundle is the costly part"""
+    return httpx.create_ssl_context()
+
+
+def _fetch(request, timeout: float) -> tuple[int, Dict, str]:
+    """Blocking urlopen returning (status, headers, decoded body)"""
+    with urllib.request.urlopen(request, timeout=timeout, context=_ssl_context()) as response:
+        return response.status, dict(response.headers), response.read().decode('utf-8')
+
+
 class SimpleRateLimiter:
     """Simple rate limiter for external API calls"""
 
@@ -59,14 +79,93 @@ class SimpleRateLimiter:
         return True
 
 
+class CircuitBreaker:
+    """Per-host circuit breaker for external API calls
+
+    A host is CLOSED until fail_max consecutive failures, then OPEN: calls
+    are refused until reset_timeout passes, after which it is HALF_OPEN and
+    one trial call decides whether it closes again or re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, fail_max: int = 3, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = defaultdict(int)
+        self.opened_at: Dict[str, float] = {}
+
+    def state(self, host: str) -> str:
+        """Current state of the circuit for a host"""
+        opened_at = self.opened_at.get(host)
+        if opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self, host: str) -> bool:
+        """Check if a call to the host may go ahead"""
+        state = self.state(host)
+        if state == self.HALF_OPEN:
+            # Let one trial call through; further calls wait on its outcome
+            self.opened_at[host] = time.monotonic()
+            return True
+        return state == self.CLOSED
+
+    def record_success(self, host: str) -> None:
+        """Close the circuit for a host"""
+        self.failures.pop(host, None)
+        self.opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """Count a failure, opening the circuit once fail_max is reached"""
+        self.failures[host] += 1
+        if self.failures[host] >= self.fail_max or host in self.opened_at:
+            if host not in self.opened_at:
+                logger.warning(f"Circuit opened for {host} after {self.failures[host]} failures")
+            self.opened_at[host] = time.monotonic()
+
+
 class ExternalAPIManager:
     """Manages external API calls with retry logic and error handling"""
 
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.rate_limiter = SimpleRateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        # Pooled client reused across calls; created on first request unless one is shared in
+        self._client = http_client
+        self._owns_client = http_client is None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for every call, created on first use"""
+        if self._client is None:
+            # HTTP/2 and a warm keep-alive pool let repeated calls to one host share connections
+            self._client = httpx.AsyncClient(
+                verify=_ssl_context(),
+                follow_redirects=True,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the HTTP client if this manager created it"""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def validate_url(self, url: str) -> bool:
         """Validate that URL is safe and properly formatted"""
@@ -110,38 +209,37 @@ class ExternalAPIManager:
 
         async def make_request():
             try:
-                if method.upper() == 'GET':
-                    req = urllib.request.Request(url, headers=headers or {})
-                else:
-                    json_data = json.dumps(data).encode('utf-8') if data else None
-                    req = urllib.request.Request(url, data=json_data, headers=headers or {})
-                    req.get_method = lambda: method.upper()
-
-                with urllib.request.urlopen(req, timeout=timeout) as response:
-                    response_data = response.read().decode('utf-8')
-
-                    try:
-                        parsed_data = json.loads(response_data)
-                    except json.JSONDecodeError:
-                        parsed_data = {"raw_response": response_data}
+                response = await self.client.request(
+                    method.upper(),
+                    url,
+                    json=data if method.upper() != 'GET' and data else None,
+                    headers=headers,
+                    timeout=timeout
+                )
 
+                if response.is_error:
                     return APIResponse(
-                        success=True,
-                        data=parsed_data,
-                        status=response.status,
-                        headers=dict(response.headers)
+                        success=False,
+                        error=f'HTTP {response.status_code}: {response.reason_phrase}',
+                        status=response.status_code
                     )
 
-            except urllib.error.HTTPError as e:
+                try:
+                    parsed_data = response.json()
+                except json.JSONDecodeError:
+                    parsed_data = {"raw_response": response.text}
+
                 return APIResponse(
-                    success=False,
-                    error=f'HTTP {e.code}: {e.reason}',
-                    status=e.code
+                    success=True,
+                    data=parsed_data,
+                    status=response.status_code,
+                    headers=dict(response.headers)
                 )
-            except urllib.error.URLError as e:
+
+            except httpx.RequestError as e:
                 return APIResponse(
                     success=False,
-                    error=f'URL Error: {e.reason}',
+                    error=f'URL Error: {e}',
                     status=None
                 )
             except Exception as e:
@@ -151,6 +249,12 @@ class ExternalAPIManager:
                     status=None
                 )
 
+        host = urllib.parse.urlparse(url).netloc
+
+        # The breaker judges whole calls: one check up front, one outcome once retries are done
+        if not self.circuit_breaker.allow(host):
+            return APIResponse(success=False, error="circuit_open", status=None)
+
         # Retry logic with exponential backoff
         last_result = None
         for attempt in range(self.max_retries):
@@ -159,6 +263,7 @@ class ExternalAPIManager:
 
                 if result.success or (result.status and result.status < 500):
                     # Success or client error (don't retry 4xx)
+                    self.circuit_breaker.record_success(host)
                     return result
 
                 if attempt < self.max_retries - 1:
@@ -177,6 +282,7 @@ class ExternalAPIManager:
                     continue
                 last_result = APIResponse(success=False, error=str(e))
 
+        self.circuit_breaker.record_failure(host)
         return last_result
 
     async def get_github_repo(self, owner: str, repo: str) -> APIResponse:
@@ -210,35 +316,27 @@ class WebSearchManager:
             encoded_query = urllib.parse.quote_plus(query)
             url = f"https://duckduckgo.com/html/?q={encoded_query}"
 
-            # Use a simple request for search
-            with urllib.request.urlopen(url, timeout=10) as response:
-                content = response.read().decode('utf-8')
+            # Use a simple request for search, off the event loop
+            _, _, content = await asyncio.to_thread(_fetch, url, 10)
 
             # Extract search results (basic parsing)
             results = []
-            lines = content.split('\n')
-
-            for i, line in enumerate(lines):
-                if '<a rel="nofollow" class="result__a" href=' in line:
-                    # Extract title and URL
-                    title_match = re.search(r'>(.*?)</a>', line)
-                    url_match = re.search(r'href="(.*?)"', line)
 
-                    if title_match and url_match:
-                        title = html.unescape(title_match.group(1).strip())
-                        url = url_match.group(1).strip()
+            for match in _RESULT_RE.finditer(content):
+                url = match.group(1).strip()
+                title = html.unescape(match.group(2).strip())
 
-                        # Clean up URL
-                        if url.startswith('/l/?uddg='):
-                            url = url[7:]  # Remove DuckDuckGo redirect prefix
+                # Clean up URL
+                if url.startswith('/l/?uddg='):
+                    url = url[7:]  # Remove DuckDuckGo redirect prefix
 
-                        results.append({
-                            'title': title,
-                            'url': url
-                        })
+                results.append({
+                    'title': title,
+                    'url': url
+                })
 
-                        if len(results) >= self.max_results:
-                            break
+                if len(results) >= self.max_results:
+                    break
 
             return APIResponse(
                 success=True,
@@ -289,9 +387,17 @@ import html
 class RequestPatternManager:
     """Main manager for all request pattern operations"""
 
-    def __init__(self):
-        self.api_manager = ExternalAPIManager()
-        self.search_manager = WebSearchManager()
+    def __init__(
+        self,
+        api_manager: Optional[ExternalAPIManager] = None,
+        search_manager: Optional[WebSearchManager] = None
+    ):
+        self.api_manager = api_manager or ExternalAPIManager()
+        self.search_manager = search_manager or WebSearchManager()
+
+    async def close(self) -> None:
+        """Release HTTP connections held by the API manager"""
+        await self.api_manager.close()
 
     async def research_github_repository(self, repo_url: str) -> APIResponse:
         """Research a GitHub repository for implementation patterns"""
@@ -11,8 +11,8 @@ from dotenv import load_dotenv
 
 from .jules_client import JulesAPIClient
 from .worker_manager import WorkerManager
-from .utils import format_timestamp, truncate_text
-from .request_patterns import ExternalAPIManager, WebSearchManager
+from .utils import format_timestamp, get_api_key, truncate_text
+from .request_patterns import request_manager
 
 # Load environment variables
 load_dotenv()
@@ -25,12 +25,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Read configuration from environment
-api_key = os.getenv("JULES_API_KEY")
+# Read configuration from environment; the key honours a per-context override
+api_key = get_api_key()
 base_url = os.getenv("JULES_API_BASE_URL", "https://jules.googleapis.com")
 api_version = os.getenv("JULES_API_VERSION", "v1alpha")
 poll_interval = int(os.getenv("WORKER_POLL_INTERVAL", "5"))
 stuck_timeout = int(os.getenv("WORKER_STUCK_TIMEOUT", "300"))
+max_poll_interval = int(os.getenv("WORKER_MAX_POLL_INTERVAL", "60"))
 
 # Create FastMCP server
 mcp = FastMCP("Jules MCP Server")
@@ -38,20 +39,20 @@ mcp = FastMCP("Jules MCP Server")
 # Global state (will be initialized in main)
 jules_client: Optional[JulesAPIClient] = None
 worker_manager: Optional[WorkerManager] = None
-request_manager = request_patterns.request_manager
 
 
 async def initialize_server():
     """Initialize Jules client and worker manager"""
     global jules_client, worker_manager
 
-    if not api_key:
+    key = get_api_key()
+    if not key:
         logger.error("JULES_API_KEY not found in environment")
         raise Exception("JULES_API_KEY environment variable is required")
 
     # Initialize Jules client
     jules_client = JulesAPIClient(
-        api_key=api_key,
+        api_key=key,
         base_url=base_url,
         api_version=api_version
     )
@@ -60,7 +61,8 @@ async def initialize_server():
     worker_manager = WorkerManager(
         jules_client=jules_client,
         poll_interval=poll_interval,
-        stuck_timeout=stuck_timeout
+        stuck_timeout=stuck_timeout,
+        max_poll_interval=max_poll_interval
     )
 
     # Start worker manager
@@ -79,6 +81,8 @@ async def shutdown_server():
     if jules_client:
         await jules_client.close()
 
+    await request_manager.close()
+
     logger.info("Jules MCP Server shutdown complete")
 
 
@@ -189,7 +193,7 @@ async def jules_cancel_session(session_id: str) -> dict:
         Dictionary with status
     """
     try:
-        await worker_manager.cancel_worker(session_id)
+        worker_manager.cancel_worker(session_id)
 
         return {
             "status": "success",
@@ -216,7 +220,7 @@ async def jules_get_activities(session_id: str, limit: int = 10) -> dict:
         Dictionary with activities list
     """
     try:
-        activities = await worker_manager.get_worker_activities(session_id, limit)
+        activities = worker_manager.get_worker_activities(session_id, limit)
 
         # Format activities as human-readable list
         activity_list = []
@@ -522,7 +526,7 @@ async def get_worker_activities_resource(session_id: str) -> str:
         Text content with recent activities
     """
     try:
-        activities = await worker_manager.get_worker_activities(session_id, limit=10)
+        activities = worker_manager.get_worker_activities(session_id, limit=10)
 
         if not activities:
             return f"No activities found for worker {session_id}"
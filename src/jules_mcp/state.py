@@ -1,9 +1,14 @@
 """Data models for worker state, activities, and state machine"""
 
+import time
+from collections import deque
 from enum import Enum
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+# Number of recent activities kept per worker
+ACTIVITIES_BUFFER_SIZE = 10
 
 
 class WorkerState(str, Enum):
@@ -84,24 +89,54 @@ class WorkerSession(BaseModel):
     state: WorkerState
     created_at: datetime
     last_activity_time: datetime
-    activities_buffer: list[Activity] = Field(default_factory=list)
+    # Monotonic clock reading of the last activity, used for stuck detection
+    last_activity_monotonic: float = Field(default_factory=time.monotonic)
+    activities_buffer: deque[Activity] = Field(
+        default_factory=lambda: deque(maxlen=ACTIVITIES_BUFFER_SIZE)
+    )
     pending_plan_id: Optional[str] = None
     error_message: Optional[str] = None
+    # Cursor for incremental activity polling
+    activities_page_token: Optional[str] = None
+    last_activity_name: Optional[str] = None
+    # Adaptive polling: monotonic time of the next poll and current interval
+    next_poll_at: float = 0.0
+    poll_backoff: float = 0.0
+
+    # Cached ISO 8601 forms of created_at / last_activity_time
+    _created_at_iso: Optional[str] = PrivateAttr(default=None)
+    _last_activity_iso: Optional[str] = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
 
+    @property
+    def created_at_iso(self) -> str:
+        """created_at as an ISO 8601 string"""
+        if self._created_at_iso is None:
+            self._created_at_iso = self.created_at.isoformat()
+        return self._created_at_iso
+
+    @property
+    def last_activity_iso(self) -> str:
+        """last_activity_time as an ISO 8601 string"""
+        if self._last_activity_iso is None:
+            self._last_activity_iso = self.last_activity_time.isoformat()
+        return self._last_activity_iso
+
     def update_from_activities(self, activities: list[Activity], stuck_timeout: int = 300) -> None:
         """Update worker state based on new activities"""
         if not activities:
             return
 
-        # Update activities buffer (keep last 10)
-        self.activities_buffer = activities[-10:]
+        # Append to activities buffer (bounded, oldest entries drop off)
+        self.activities_buffer.extend(activities)
+        self.last_activity_name = activities[-1].name
 
-        # Update last activity time
-        if activities:
-            self.last_activity_time = datetime.now()
+        # Update last activity time (wall clock for display, monotonic for timeouts)
+        self.last_activity_time = datetime.now()
+        self.last_activity_monotonic = time.monotonic()
+        self._last_activity_iso = None
 
         # Detect new state
         new_state = self.detect_state()
@@ -145,35 +180,28 @@ class WorkerSession(BaseModel):
         # Default to PLANNING if no clear state
         return WorkerState.PLANNING
 
-    def is_blocked(self) -> bool:
-        """Check if worker needs human intervention"""
+    def blocker(self, stuck_timeout: int = 300) -> Optional[str]:
+        """Describe why worker needs human intervention, or None if not blocked"""
         # Blocked if waiting for plan approval
-        if self.state == WorkerState.WAITING_APPROVAL:
-            return True
-
-        # Blocked if failed
-        if self.state == WorkerState.FAILED:
-            return True
-
-        # Potentially stuck if no activity for too long (5 minutes)
-        if self.state == WorkerState.EXECUTING:
-            time_since_activity = (datetime.now() - self.last_activity_time).total_seconds()
-            if time_since_activity > 300:  # 5 minutes
-                return True
-
-        return False
-
-    def get_blocker_reason(self) -> Optional[str]:
-        """Describe why worker is blocked"""
         if self.state == WorkerState.WAITING_APPROVAL:
             return "Plan generated, waiting for approval"
 
+        # Blocked if failed
         if self.state == WorkerState.FAILED:
             return f"Failed: {self.error_message or 'Unknown error'}"
 
+        # Potentially stuck if no activity for too long
         if self.state == WorkerState.EXECUTING:
-            time_since_activity = (datetime.now() - self.last_activity_time).total_seconds()
-            if time_since_activity > 300:
+            time_since_activity = time.monotonic() - self.last_activity_monotonic
+            if time_since_activity > stuck_timeout:
                 return f"No activity for {int(time_since_activity / 60)} minutes (potentially stuck)"
 
         return None
+
+    def is_blocked(self, stuck_timeout: int = 300) -> bool:
+        """Check if worker needs human intervention"""
+        return self.blocker(stuck_timeout) is not None
+
+    def get_blocker_reason(self, stuck_timeout: int = 300) -> Optional[str]:
+        """Describe why worker is blocked"""
+        return self.blocker(stuck_timeout)
@@ -1,8 +1,19 @@
 """Helper functions for Jules MCP server"""
 
+import os
+from contextvars import ContextVar
 from datetime import datetime
 from .state import ActivityType
 
+# Per-context API key override, so concurrent callers (e.g. tests) can supply
+# a key without mutating os.environ for everyone else
+JULES_API_KEY: ContextVar[str | None] = ContextVar("JULES_API_KEY", default=None)
+
+
+def get_api_key() -> str | None:
+    """Return the Jules API key for the current context, falling back to the environment"""
+    return JULES_API_KEY.get() or os.getenv("JULES_API_KEY")
+
 
 def detect_activity_type(activity_data: dict) -> ActivityType:
     """Examine activity JSON structure and determine type"""
@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime
+from itertools import islice
 from typing import Optional
 
 from .jules_client import JulesAPIClient
@@ -11,10 +13,61 @@ from .state import WorkerState, WorkerSession, Activity
 logger = logging.getLogger(__name__)
 
 
+def _start_task(coro) -> asyncio.Task:
+    """
+    Wrap a coroutine in a task on the running loop
+
+    On Python 3.12+ the task starts eagerly, running synchronously until its
+    first real suspension; the loop's own task factory is left untouched so
+    the host application's tasks keep their usual scheduling.
+    """
+    loop = asyncio.get_running_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        return asyncio.eager_task_factory(loop, coro)
+    return loop.create_task(coro)
+
+
+class WorkerNotFoundError(Exception):
+    """Raised when a session ID does not match any tracked worker"""
+
+    def __init__(self, session_id: str):
+        super().__init__(f"Worker not found: {session_id}")
+        self.session_id = session_id
+
+
+class BulkCreateError(Exception):
+    """Raised when some sessions in a bulk creation fail"""
+
+    def __init__(self, session_ids: list[str], errors: dict[int, str], total: int):
+        details = "; ".join(f"spec {index} {error}" for index, error in errors.items())
+        super().__init__(f"Failed to create {len(errors)} of {total} workers: {details}")
+        self.session_ids = session_ids
+        self.errors = errors
+
+
 class WorkerManager:
     """Manages multiple Jules worker sessions with background polling"""
 
-    def __init__(self, jules_client: JulesAPIClient, poll_interval: int, stuck_timeout: int):
+    # Upper bound on concurrent list_activities requests per poll cycle
+    MAX_CONCURRENT_POLLS = 32
+
+    # Activities requested per poll; polls are incremental so pages stay small
+    ACTIVITY_PAGE_SIZE = 10
+
+    # States that still need polling (not completed, failed, or cancelled)
+    _ACTIVE_STATES = frozenset((
+        WorkerState.PLANNING,
+        WorkerState.WAITING_APPROVAL,
+        WorkerState.EXECUTING
+    ))
+
+    def __init__(
+        self,
+        jules_client: JulesAPIClient,
+        poll_interval: int,
+        stuck_timeout: int,
+        max_poll_interval: int = 60
+    ):
         """
         Initialize worker manager
 
@@ -22,16 +75,27 @@ class WorkerManager:
             jules_client: Jules API client
             poll_interval: Seconds between polls for active workers
             stuck_timeout: Seconds of no activity before marking as stuck
+            max_poll_interval: Upper bound in seconds that the poll interval of
+                an idle worker backs off to (default: 60)
         """
         self.jules_client = jules_client
         self.poll_interval = poll_interval
         self.stuck_timeout = stuck_timeout
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
 
         # Worker tracking
         self.workers: dict[str, WorkerSession] = {}
+        # Workers in creation order (oldest first); created_at never changes
+        self._workers_by_creation: list[WorkerSession] = []
+        # Session IDs of workers in an active state, i.e. still being polled
+        self._active: set[str] = set()
         self.polling_task: Optional[asyncio.Task] = None
         self.running = False
 
+        # Set on worker state transitions to wake the polling loop early
+        self._wake = asyncio.Event()
+        self._poll_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_POLLS)
+
     async def start(self) -> None:
         """Start background polling task"""
         if self.running:
@@ -39,7 +103,7 @@ class WorkerManager:
             return
 
         self.running = True
-        self.polling_task = asyncio.create_task(self._polling_loop())
+        self.polling_task = _start_task(self._polling_loop())
         logger.info("Worker manager started")
 
     async def stop(self) -> None:
@@ -49,7 +113,8 @@ class WorkerManager:
 
         self.running = False
 
-        # Cancel and wait for polling task
+        # Cancel and wait for polling task; cancelling it also cancels and
+        # awaits any in-flight list_activities calls gathered by the loop
         if self.polling_task:
             self.polling_task.cancel()
             try:
@@ -89,31 +154,57 @@ class WorkerManager:
             github_branch=github_branch
         )
 
-        # Extract session ID
-        session_id = response.get("name", "").split("/")[-1]
+        session_id = self._register_worker(response, prompt, source)
+        self._wake.set()
 
-        if not session_id:
-            raise Exception("Failed to extract session ID from response")
+        logger.info("Created worker session: %s", session_id)
+        return session_id
 
-        # Create WorkerSession object
-        now = datetime.now()
-        worker = WorkerSession(
-            session_id=session_id,
-            task_description=prompt,
-            source=source,
-            state=WorkerState.PLANNING,
-            created_at=now,
-            last_activity_time=now,
-            activities_buffer=[],
-            pending_plan_id=None,
-            error_message=None
+    async def create_workers_bulk(self, specs: list[dict]) -> list[str]:
+        """
+        Create several worker Jules sessions concurrently
+
+        Args:
+            specs: One dict per worker with create_worker's arguments
+                (prompt, source, title and optionally github_branch)
+
+        Returns:
+            Session IDs, in the same order as specs
+
+        Raises:
+            BulkCreateError: If any session creation fails; its session_ids
+                lists the workers that were created and are still tracked,
+                and errors maps each failed spec index to its message
+        """
+        async def create(spec: dict) -> dict:
+            # Called inside the coroutine so a malformed spec fails only its own slot
+            return await self.jules_client.create_session(**spec)
+
+        responses = await asyncio.gather(
+            *(_start_task(create(spec)) for spec in specs),
+            return_exceptions=True
         )
 
-        # Add to workers dict
-        self.workers[session_id] = worker
+        session_ids = []
+        errors = {}
+        for index, (spec, response) in enumerate(zip(specs, responses)):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                session_ids.append(
+                    self._register_worker(response, spec["prompt"], spec["source"])
+                )
+            except Exception as e:
+                errors[index] = f"({spec.get('title', spec.get('prompt', ''))}): {e}"
 
-        logger.info(f"Created worker session: {session_id}")
-        return session_id
+        if session_ids:
+            self._wake.set()
+            logger.info("Created %d worker sessions", len(session_ids))
+
+        if errors:
+            raise BulkCreateError(session_ids, errors, len(specs))
+
+        return session_ids
 
     async def approve_worker_plan(self, session_id: str) -> None:
         """
@@ -123,12 +214,10 @@ class WorkerManager:
             session_id: Worker session ID
 
         Raises:
-            Exception: If worker not found or approval fails
+            WorkerNotFoundError: If worker not found
+            Exception: If approval fails
         """
-        if session_id not in self.workers:
-            raise Exception(f"Worker not found: {session_id}")
-
-        worker = self.workers[session_id]
+        worker = self._get_worker(session_id)
 
         if worker.state != WorkerState.WAITING_APPROVAL:
             raise Exception(f"Worker is not waiting for approval (state: {worker.state})")
@@ -139,8 +228,9 @@ class WorkerManager:
         # Update worker state
         worker.state = WorkerState.EXECUTING
         worker.pending_plan_id = None
+        self._poll_soon(worker)
 
-        logger.info(f"Approved plan for worker: {session_id}")
+        logger.info("Approved plan for worker: %s", session_id)
 
     async def send_worker_message(self, session_id: str, message: str) -> dict:
         """
@@ -154,18 +244,19 @@ class WorkerManager:
             Activity response
 
         Raises:
-            Exception: If worker not found or message fails
+            WorkerNotFoundError: If worker not found
+            Exception: If message fails
         """
-        if session_id not in self.workers:
-            raise Exception(f"Worker not found: {session_id}")
+        worker = self._get_worker(session_id)
 
         # Send message via Jules API
         response = await self.jules_client.send_message(session_id, message)
+        self._poll_soon(worker)
 
-        logger.info(f"Sent message to worker: {session_id}")
+        logger.info("Sent message to worker: %s", session_id)
         return response
 
-    async def cancel_worker(self, session_id: str) -> None:
+    def cancel_worker(self, session_id: str) -> None:
         """
         Cancel a worker session
 
@@ -173,17 +264,16 @@ class WorkerManager:
             session_id: Worker session ID
 
         Raises:
-            Exception: If worker not found
+            WorkerNotFoundError: If worker not found
         """
-        if session_id not in self.workers:
-            raise Exception(f"Worker not found: {session_id}")
-
-        worker = self.workers[session_id]
+        worker = self._get_worker(session_id)
         worker.state = WorkerState.CANCELLED
+        self._active.discard(session_id)
+        self._wake.set()
 
-        logger.info(f"Cancelled worker: {session_id}")
+        logger.info("Cancelled worker: %s", session_id)
 
-    async def get_worker_activities(self, session_id: str, limit: int = 10) -> list[Activity]:
+    def get_worker_activities(self, session_id: str, limit: int = 10) -> list[Activity]:
         """
         Get recent activities for a worker
 
@@ -195,13 +285,10 @@ class WorkerManager:
             List of recent activities
 
         Raises:
-            Exception: If worker not found
+            WorkerNotFoundError: If worker not found
         """
-        if session_id not in self.workers:
-            raise Exception(f"Worker not found: {session_id}")
-
-        worker = self.workers[session_id]
-        return worker.activities_buffer[:limit]
+        worker = self._get_worker(session_id)
+        return list(islice(worker.activities_buffer, limit))
 
     def get_all_workers(self) -> list[WorkerSession]:
         """
@@ -210,11 +297,7 @@ class WorkerManager:
         Returns:
             List of all workers, sorted by created_at descending (newest first)
         """
-        return sorted(
-            self.workers.values(),
-            key=lambda w: w.created_at,
-            reverse=True
-        )
+        return self._workers_by_creation[::-1]
 
     def get_worker_status(self, session_id: str) -> dict:
         """
@@ -227,25 +310,59 @@ class WorkerManager:
             Status dictionary with all relevant information
 
         Raises:
-            Exception: If worker not found
+            WorkerNotFoundError: If worker not found
         """
-        if session_id not in self.workers:
-            raise Exception(f"Worker not found: {session_id}")
-
-        worker = self.workers[session_id]
+        worker = self._get_worker(session_id)
+        blocker_reason = worker.blocker(stuck_timeout=self.stuck_timeout)
 
         return {
             "session_id": session_id,
             "task": worker.task_description,
             "state": worker.state.value,
-            "is_blocked": worker.is_blocked(),
-            "blocker_reason": worker.get_blocker_reason(),
+            "is_blocked": blocker_reason is not None,
+            "blocker_reason": blocker_reason,
             "pending_plan_id": worker.pending_plan_id,
             "error_message": worker.error_message,
-            "last_activity": worker.last_activity_time.isoformat(),
-            "created_at": worker.created_at.isoformat()
+            "last_activity": worker.last_activity_iso,
+            "created_at": worker.created_at_iso
         }
 
+    def _register_worker(self, response: dict, prompt: str, source: str) -> str:
+        """Build and track a WorkerSession from a create_session response"""
+        # Extract session ID
+        session_id = response.get("name", "").split("/")[-1]
+
+        if not session_id:
+            raise Exception("Failed to extract session ID from response")
+
+        # Create WorkerSession object
+        now = datetime.now()
+        worker = WorkerSession(
+            session_id=session_id,
+            task_description=prompt,
+            source=source,
+            state=WorkerState.PLANNING,
+            created_at=now,
+            last_activity_time=now,
+            pending_plan_id=None,
+            error_message=None,
+            poll_backoff=self.poll_interval
+        )
+
+        # Add to workers dict
+        self.workers[session_id] = worker
+        self._workers_by_creation.append(worker)
+        self._active.add(session_id)
+
+        return session_id
+
+    def _get_worker(self, session_id: str) -> WorkerSession:
+        """Look up a worker, raising WorkerNotFoundError if unknown"""
+        worker = self.workers.get(session_id)
+        if worker is None:
+            raise WorkerNotFoundError(session_id)
+        return worker
+
     async def _polling_loop(self) -> None:
         """Background polling loop to fetch activities for active workers"""
         logger.info("Polling loop started")
@@ -253,53 +370,139 @@ class WorkerManager:
         while self.running:
             try:
                 # Get active workers (not completed, failed, or cancelled)
-                active_states = {
-                    WorkerState.PLANNING,
-                    WorkerState.WAITING_APPROVAL,
-                    WorkerState.EXECUTING
-                }
-
-                active_workers = [
-                    worker for worker in self.workers.values()
-                    if worker.state in active_states
-                ]
-
-                # Poll each active worker
-                for worker in active_workers:
-                    try:
-                        # Fetch latest activities
-                        response = await self.jules_client.list_activities(
-                            worker.session_id,
-                            page_size=50
-                        )
-
-                        # Parse activities
-                        activities_data = response.get("activities", [])
-                        activities = [
-                            Activity.from_api_response(data)
-                            for data in activities_data
-                        ]
-
-                        # Update worker state
-                        if activities:
-                            worker.update_from_activities(
-                                activities,
-                                stuck_timeout=self.stuck_timeout
-                            )
-
-                    except Exception as e:
-                        logger.error(f"Error polling worker {worker.session_id}: {e}")
-                        # Continue polling other workers
-
-                # Sleep before next poll
-                await asyncio.sleep(self.poll_interval)
+                active_workers = [self.workers[sid] for sid in self._active]
+
+                # Nothing to poll: sleep until a worker is created or changes state
+                if not active_workers:
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
+
+                # This cycle picks up every state change signalled so far
+                self._wake.clear()
+
+                # Poll workers whose adaptive interval has elapsed, concurrently
+                now = time.monotonic()
+                due_workers = [w for w in active_workers if w.next_poll_at <= now]
+                responses = await asyncio.gather(
+                    *(_start_task(self._fetch_activities(worker)) for worker in due_workers),
+                    return_exceptions=True
+                )
+
+                for worker, response in zip(due_workers, responses):
+                    had_activity = False
+                    more_pending = False
+
+                    if isinstance(response, Exception):
+                        logger.error("Error polling worker %s: %s", worker.session_id, response)
+                    else:
+                        more_pending = bool(response.get("nextPageToken"))
+                        try:
+                            had_activity = self._apply_activities(worker, response)
+                        except Exception:
+                            logger.exception("Error updating worker %s", worker.session_id)
+
+                    self._schedule_next_poll(worker, had_activity, more_pending)
+
+                # Wait until the next worker is due, or earlier if a worker changes state
+                if self._active:
+                    next_poll_at = min(self.workers[sid].next_poll_at for sid in self._active)
+                    await self._wait_for_wake(max(next_poll_at - time.monotonic(), 0))
 
             except asyncio.CancelledError:
                 logger.info("Polling loop cancelled")
                 break
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
+            except Exception:
+                logger.exception("Error in polling loop")
                 # Continue polling despite errors
                 await asyncio.sleep(self.poll_interval)
 
         logger.info("Polling loop stopped")
+
+    async def _fetch_activities(self, worker: WorkerSession) -> dict:
+        """Fetch latest activities for a worker, bounded by the poll semaphore"""
+        async with self._poll_semaphore:
+            return await self.jules_client.list_activities(
+                worker.session_id,
+                page_size=self.ACTIVITY_PAGE_SIZE,
+                page_token=worker.activities_page_token
+            )
+
+    def _apply_activities(self, worker: WorkerSession, response: dict) -> bool:
+        """
+        Parse an activities response and update worker state
+
+        Returns:
+            True if the response contained activities not seen before
+        """
+        # Advance to the next page if there is one; otherwise keep re-reading
+        # the current page, which is where new activities will appear
+        next_page_token = response.get("nextPageToken")
+        if next_page_token:
+            worker.activities_page_token = next_page_token
+
+        activities_data = self._unseen_activities(worker, response.get("activities"))
+        if not activities_data:
+            return False
+
+        activities = [
+            Activity.from_api_response(data)
+            for data in activities_data
+        ]
+        worker.update_from_activities(
+            activities,
+            stuck_timeout=self.stuck_timeout
+        )
+
+        # Stop polling workers that reached a terminal state
+        if worker.state not in self._ACTIVE_STATES:
+            self._active.discard(worker.session_id)
+
+        return True
+
+    def _schedule_next_poll(
+        self,
+        worker: WorkerSession,
+        had_activity: bool,
+        more_pending: bool = False
+    ) -> None:
+        """Reset the worker's poll interval on activity, otherwise back off"""
+        if had_activity:
+            worker.poll_backoff = self.poll_interval
+        else:
+            worker.poll_backoff = min(
+                max(worker.poll_backoff, self.poll_interval) * 2,
+                self.max_poll_interval
+            )
+
+        if more_pending:
+            # Further pages are already waiting, so fetch them on the next cycle
+            worker.next_poll_at = 0.0
+            self._wake.set()
+        else:
+            worker.next_poll_at = time.monotonic() + worker.poll_backoff
+
+    def _poll_soon(self, worker: WorkerSession) -> None:
+        """Poll a worker on the next cycle and reset its backoff"""
+        worker.poll_backoff = self.poll_interval
+        worker.next_poll_at = 0.0
+        self._wake.set()
+
+    @staticmethod
+    def _unseen_activities(worker: WorkerSession, activities_data: Optional[list]) -> list:
+        """Drop activities up to and including the last one already applied"""
+        if not activities_data or worker.last_activity_name is None:
+            return activities_data or []
+
+        for index in range(len(activities_data) - 1, -1, -1):
+            if activities_data[index].get("name") == worker.last_activity_name:
+                return activities_data[index + 1:]
+
+        return activities_data
+
+    async def _wait_for_wake(self, timeout: float) -> None:
+        """Wait until the wake event is set or the timeout expires"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -4,14 +4,16 @@ Comprehensive testing suite for Enhanced Jules API implementation
 Tests polling, notifications, throughput logging, and activity monitoring
 """
 
-import os
+import sys
+import math
+import dataclasses
 import time
 import json
 import threading
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+
+import pytest
 
 # Import our enhanced API
 from jules_enhanced_api import (
@@ -20,521 +22,744 @@ from jules_enhanced_api import (
     JulesConfig,
     ThroughputMetrics,
     SessionState,
-    ActivityType
+    ActivityType,
+    RESPONSE_TIME_WINDOW,
+    format_timestamp_ns
 )
 
-class TestJulesEnhancedAPI(unittest.TestCase):
-    """Comprehensive test suite for enhanced Jules API"""
-
-    def setUp(self):
-        """Set up test environment"""
-        self.config = JulesConfig(
-            api_key="AQ.test_key_for_unit_tests",
-            polling_interval=1,  # Fast polling for tests
-            max_polling_duration=10,  # Short timeout for tests
-            throughput_logging=True,
-            enable_notifications=True
-        )
-        self.client = JulesEnhancedAPIClient(self.config)
-        self.workflow = JulesEnhancedWorkflowManager(self.client)
-
-    def test_configuration_initialization(self):
-        """Test proper configuration initialization"""
-        self.assertEqual(self.config.api_key, "AQ.test_key_for_unit_tests")
-        self.assertEqual(self.config.base_url, "https://jules.googleapis.com")
-        self.assertEqual(self.config.polling_interval, 1)
-        self.assertEqual(self.config.max_polling_duration, 10)
-        self.assertTrue(self.config.throughput_logging)
-        self.assertTrue(self.config.enable_notifications)
-
-    def test_throughput_metrics_initialization(self):
-        """Test throughput metrics initialization"""
-        metrics = self.client.metrics
-        self.assertEqual(metrics.total_requests, 0)
-        self.assertEqual(metrics.successful_requests, 0)
-        self.assertEqual(metrics.failed_requests, 0)
-        self.assertEqual(metrics.success_rate, 0)
-        self.assertEqual(len(metrics.response_times), 0)
-
-    def test_throughput_metrics_calculation(self):
-        """Test throughput metrics calculations"""
-        # Simulate some requests
-        self.client.metrics.total_requests = 100
-        self.client.metrics.successful_requests = 85
-        self.client.metrics.response_times = [0.1, 0.2, 0.15, 0.3, 0.25]
-
-        expected_success_rate = 85.0
-        expected_avg_response_time = 0.2
-
-        self.assertEqual(self.client.metrics.success_rate, expected_success_rate)
-        self.assertAlmostEqual(self.client.metrics.average_response_time, expected_avg_response_time, places=3)
-
-    def test_unique_session_id_generation(self):
-        """Test unique session ID generation"""
-        task_desc = "Test task for JWT authentication"
-        session_id1 = self.workflow.generate_unique_session_id(task_desc)
-        session_id2 = self.workflow.generate_unique_session_id(task_desc + " variant")
-
-        self.assertNotEqual(session_id1, session_id2)
-        self.assertTrue(session_id1.startswith("jules-workflow-"))
-        self.assertTrue(session_id2.startswith("jules-workflow-"))
-
-    def test_unique_branch_name_generation(self):
-        """Test unique branch name generation"""
-        task_desc = "Test task"
-        session_id = "test-session-123"
-        branch1 = self.workflow.generate_unique_branch_name(task_desc, session_id)
-        time.sleep(0.1)  # Ensure different timestamps
-        branch2 = self.workflow.generate_unique_branch_name(task_desc, session_id + "2")
-
-        self.assertNotEqual(branch1, branch2)
-        self.assertIn(session_id, branch1)
-
-    @patch('urllib.request.urlopen')
-    def test_session_creation_success(self, mock_urlopen):
-        """Test successful session creation"""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            'name': 'sessions/test-session-123',
-            'sessionId': 'test-session-123',
-            'state': SessionState.ACTIVE.value
-        }).encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
-        session_config = {
-            'prompt': 'Test session creation',
-            'sourceContext': {
-                'source': 'sources/github/test/repo'
-            }
-        }
+# Encoded response bodies, serialized once at import rather than per test
+_SESSION_OK = json.dumps({
+    'name': 'sessions/test-session-123',
+    'sessionId': 'test-session-123',
+    'state': SessionState.ACTIVE.value
+}).encode('utf-8')
+_MONITORED_SESSION_OK = json.dumps({
+    'name': 'sessions/monitored-session-456',
+    'sessionId': 'monitored-session-456',
+    'state': SessionState.ACTIVE.value
+}).encode('utf-8')
+_PLAN_APPROVED = json.dumps({
+    'approved': True,
+    'message': 'Plan approved successfully'
+}).encode('utf-8')
+_PLAN_REJECTED = json.dumps({
+    'approved': False,
+    'message': 'Plan rejected'
+}).encode('utf-8')
+_ACTIVITIES_OK = json.dumps({
+    'activities': [
+        {'type': ActivityType.MESSAGE_SENT.value, 'message': 'Starting...'},
+        {'type': ActivityType.PLAN_GENERATED.value, 'message': 'Plan created'}
+    ]
+}).encode('utf-8')
+
+# Substrings test_throughput_report_generation expects in the report
+_EXPECTED_REPORT_LINES = (
+    "Jules API Throughput Report",
+    "Total Requests: 50",
+    "Successful: 45",
+    "Success Rate: 90.00%",
+    "Activities Processed: 25",
+    "Polling Cycles: 100",
+)
+
+# Base configuration; tests take copies via dataclasses.replace
+_CONFIG_PROTO = JulesConfig(
+    api_key="AQ.test_key_for_unit_tests",
+    polling_interval=1,  # Fast polling for tests
+    max_polling_duration=10,  # Short timeout for tests
+    throughput_logging=True,
+    enable_notifications=True
+)
+
+
+class _FakeResp:
+    """Minimal urlopen response usable as a context manager"""
+
+    def __init__(self, status, data, reason='OK'):
+        self.status = status
+        self.reason = reason
+        self._data = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def read(self):
+        return self._data
+
+
+@pytest.fixture
+def config():
+    """Fresh test configuration per test, so tests stay independent under xdist"""
+    return dataclasses.replace(_CONFIG_PROTO)
+
+
+@pytest.fixture
+def client(config):
+    """Fresh client per test, shut down on teardown"""
+    client = JulesEnhancedAPIClient(config)
+    yield client
+    client.shutdown()
+
+
+@pytest.fixture
+def workflow(client):
+    """Workflow manager bound to the per-test client"""
+    return JulesEnhancedWorkflowManager(client)
+
+
+def test_configuration_initialization(config):
+    """Test proper configuration initialization"""
+    assert config.api_key == "AQ.test_key_for_unit_tests"
+    assert config.base_url == "https://jules.googleapis.com"
+    assert config.polling_interval == 1
+    assert config.max_polling_duration == 10
+    assert config.throughput_logging
+    assert config.enable_notifications
+
+
+@pytest.mark.parametrize("attribute", [
+    "total_requests",
+    "successful_requests",
+    "failed_requests",
+    "success_rate",
+])
+def test_throughput_metrics_initialization(client, attribute):
+    """Test throughput metrics initialization"""
+    assert getattr(client.metrics, attribute) == 0
+
+
+def test_throughput_metrics_response_times_initialization(client):
+    """Test response times start empty"""
+    assert len(client.metrics.response_times) == 0
+
+
+def test_throughput_metrics_calculation(client):
+    """Test throughput metrics calculations"""
+    # Simulate some requests
+    client.metrics.total_requests = 100
+    client.metrics.successful_requests = 85
+    client.metrics.record_response_times([0.1, 0.2, 0.15, 0.3, 0.25])
+
+    expected_success_rate = 85.0
+    expected_avg_response_time = 0.2
+
+    assert client.metrics.success_rate == expected_success_rate
+    assert math.isclose(client.metrics.average_response_time, expected_avg_response_time, rel_tol=1e-9)
 
-        result = self.client.create_session(session_config)
 
-        self.assertEqual(result['status'], 'success')
-        self.assertIsNotNone(result['data'])
-        self.assertEqual(result['data']['name'], 'sessions/test-session-123')
+def test_response_time_window_is_bounded(client):
+    """Test the response time window stays bounded while the average covers every request"""
+    client.metrics.record_response_times([1.0] * RESPONSE_TIME_WINDOW)
+    client.metrics.record_response_times([3.0] * RESPONSE_TIME_WINDOW)
 
-    @patch('urllib.request.urlopen')
-    def test_session_creation_failure(self, mock_urlopen):
-        """Test session creation failure handling"""
-        # Mock failed API response
-        mock_urlopen.side_effect = Exception("API Error")
+    assert len(client.metrics.response_times) == RESPONSE_TIME_WINDOW
+    assert client.metrics.response_time_count == 2 * RESPONSE_TIME_WINDOW
+    assert client.metrics.average_response_time == 2.0
 
-        session_config = {
-            'prompt': 'Test session creation',
-            'sourceContext': {
-                'source': 'sources/github/test/repo'
-            }
+
+def test_average_response_time_compensates_rounding(client):
+    """Test many small batches do not accumulate floating point drift"""
+    for _ in range(10_000):
+        client.metrics.record_response_times([0.1])
+
+    assert client.metrics.average_response_time == 0.1
+
+
+def test_log_throughput_batch(client):
+    """Test batched throughput logging matches per-request counters"""
+    now = time.time()
+    client._log_throughput_batch(
+        start_times=[now, now, now, now],
+        bytes_sent=100,
+        bytes_received=500,
+        successes=[True, True, False, True]
+    )
+
+    assert client.metrics.total_requests == 4
+    assert client.metrics.successful_requests == 3
+    assert client.metrics.failed_requests == 1
+    assert client.metrics.bytes_sent == 400
+    assert client.metrics.bytes_received == 2000
+    assert len(client.metrics.response_times) == 4
+
+
+def test_format_timestamp_ns():
+    """Test nanosecond timestamps render as ISO 8601 UTC"""
+    assert format_timestamp_ns(0) == "1970-01-01T00:00:00+00:00"
+    assert format_timestamp_ns(1_735_732_800_500_000_000) == "2025-01-01T12:00:00.500000+00:00"
+
+
+def test_unique_session_id_generation(workflow):
+    """Test unique session ID generation"""
+    task_desc = "Test task for JWT authentication"
+    session_id1 = workflow.generate_unique_session_id(task_desc)
+    session_id2 = workflow.generate_unique_session_id(task_desc + " variant")
+
+    assert session_id1 != session_id2
+    assert session_id1.startswith("jules-workflow-")
+    assert session_id2.startswith("jules-workflow-")
+
+
+@patch('jules_enhanced_api.datetime')
+def test_unique_branch_name_generation(mock_datetime, workflow):
+    """Test unique branch name generation"""
+    # Stub the clock so the two calls see different timestamps without sleeping
+    mock_datetime.now.side_effect = [
+        datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, 12, 0, 1, tzinfo=timezone.utc)
+    ]
+
+    task_desc = "Test task"
+    session_id = "test-session-123"
+    branch1 = workflow.generate_unique_branch_name(task_desc, session_id)
+    branch2 = workflow.generate_unique_branch_name(task_desc, session_id + "2")
+
+    assert branch1 != branch2
+    assert session_id in branch1
+    assert branch1.endswith("20250101-120000")
+    assert branch2.endswith("20250101-120001")
+
+
+@pytest.mark.parametrize("method,args,body,endpoint", [
+    (
+        "create_session",
+        ({'prompt': 'Test session creation', 'sourceContext': {'source': 'sources/github/test/repo'}},),
+        _SESSION_OK,
+        "/v1alpha/sessions"
+    ),
+    (
+        "approve_plan",
+        ('sessions/test-session', {'approvalData': {'approved': True, 'feedback': 'Looks good'}}),
+        _PLAN_APPROVED,
+        "/v1alpha/sessions/test-session:approvePlan"
+    ),
+    (
+        "reject_plan",
+        ('sessions/test-session', 'Needs more details'),
+        _PLAN_REJECTED,
+        "/v1alpha/sessions/test-session:approvePlan"
+    ),
+], ids=["create_session", "approve_plan", "reject_plan"])
+def test_post_request_success(mock_urlopen, client, method, args, body, endpoint):
+    """Test session creation, plan approval and plan rejection succeed"""
+    mock_urlopen.return_value = _FakeResp(200, body)
+
+    result = getattr(client, method)(*args)
+
+    assert result['status'] == 'success'
+    assert result['data'] == json.loads(body)
+
+    # First call is the POST itself; create_session may start polling afterwards
+    request = mock_urlopen.call_args_list[0][0][0]
+    assert request.get_method() == 'POST'
+    assert request.full_url == client.config.base_url + endpoint
+
+
+def test_session_creation_failure(mock_urlopen, client):
+    """Test session creation failure handling"""
+    # Mock failed API response
+    mock_urlopen.side_effect = Exception("API Error")
+
+    session_config = {
+        'prompt': 'Test session creation',
+        'sourceContext': {
+            'source': 'sources/github/test/repo'
         }
+    }
 
-        result = self.client.create_session(session_config)
-
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['error_type'], 'EXCEPTION')
-        self.assertEqual(result['error_message'], 'API Error')
-
-    @patch('urllib.request.urlopen')
-    def test_plan_approval(self, mock_urlopen):
-        """Test plan approval functionality"""
-        # Mock successful approval response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            'approved': True,
-            'message': 'Plan approved successfully'
-        }).encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
-        result = self.client.approve_plan('sessions/test-session', {
-            'approvalData': {
-                'approved': True,
-                'feedback': 'Looks good'
-            }
-        })
+    result = client.create_session(session_config)
 
-        self.assertEqual(result['status'], 'success')
+    assert result['status'] == 'error'
+    assert result['error_type'] == 'EXCEPTION'
+    assert result['error_message'] == 'API Error'
 
-    @patch('urllib.request.urlopen')
-    def test_plan_rejection(self, mock_urlopen):
-        """Test plan rejection functionality"""
-        # Mock successful rejection response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            'approved': False,
-            'message': 'Plan rejected'
-        }).encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
 
-        result = self.client.reject_plan('sessions/test-session', 'Needs more details')
+def test_notification_handler_management(client):
+    """Test notification handler add/remove functionality"""
+    def dummy_handler(session_name, activity):
+        pass
 
-        self.assertEqual(result['status'], 'success')
+    # Initially no handlers
+    assert len(client.notification_handlers) == 0
 
-    def test_notification_handler_management(self):
-        """Test notification handler add/remove functionality"""
-        def dummy_handler(session_name, activity):
-            pass
+    # Add handler
+    client.add_notification_handler(dummy_handler)
+    assert len(client.notification_handlers) == 1
+
+    # Add another handler
+    def dummy_handler2(session_name, activity):
+        pass
+    client.add_notification_handler(dummy_handler2)
+    assert len(client.notification_handlers) == 2
 
-        # Initially no handlers
-        self.assertEqual(len(self.client.notification_handlers), 0)
+    # Remove first handler
+    client.remove_notification_handler(dummy_handler)
+    assert len(client.notification_handlers) == 1
 
-        # Add handler
-        self.client.add_notification_handler(dummy_handler)
-        self.assertEqual(len(self.client.notification_handlers), 1)
+    # Try to remove non-existent handler
+    def non_existent_handler(session_name, activity):
+        pass
+    client.remove_notification_handler(non_existent_handler)
+    assert len(client.notification_handlers) == 1
 
-        # Add another handler
-        def dummy_handler2(session_name, activity):
+    # Bound methods are looked up by equality, not identity
+    class Recorder:
+        def handle(self, session_name, activity):
             pass
-        self.client.add_notification_handler(dummy_handler2)
-        self.assertEqual(len(self.client.notification_handlers), 2)
 
-        # Remove first handler
-        self.client.remove_notification_handler(dummy_handler)
-        self.assertEqual(len(self.client.notification_handlers), 1)
+    recorder = Recorder()
+    client.add_notification_handler(recorder.handle)
+    client.remove_notification_handler(recorder.handle)
+    assert list(client.notification_handlers.values()) == [dummy_handler2]
 
-        # Try to remove non-existent handler
-        def non_existent_handler(session_name, activity):
-            pass
-        self.client.remove_notification_handler(non_existent_handler)
-        self.assertEqual(len(self.client.notification_handlers), 1)
-
-    def test_activities_hashing(self):
-        """Test activity hashing for change detection"""
-        activities1 = [
-            {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
-            {'type': 'MESSAGE_SENT', 'message': 'Test message'}
-        ]
-
-        activities2 = [
-            {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
-            {'type': 'MESSAGE_SENT', 'message': 'Test message'}
-        ]
-
-        activities3 = [
-            {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
-            {'type': 'MESSAGE_SENT', 'message': 'Different message'}
-        ]
-
-        hash1 = self.client._hash_activities(activities1)
-        hash2 = self.client._hash_activities(activities2)
-        hash3 = self.client._hash_activities(activities3)
-
-        # Same activities should have same hash
-        self.assertEqual(hash1, hash2)
-
-        # Different activities should have different hash
-        self.assertNotEqual(hash1, hash3)
-
-    @patch('urllib.request.urlopen')
-    def test_monitored_session_creation(self, mock_urlopen):
-        """Test monitored session creation with workflow manager"""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            'name': 'sessions/monitored-session-456',
-            'sessionId': 'monitored-session-456',
-            'state': SessionState.ACTIVE.value
-        }).encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
-        def test_handler(session_name, activity):
-            pass
 
-        result = self.workflow.create_monitored_session(
-            task_description="Add comprehensive logging system",
-            source="sources/github/example/logging-project",
-            github_branch="main",
-            title="Logging System Implementation",
-            notification_handlers=[test_handler]
-        )
+def test_activities_hashing(client):
+    """Test activity hashing for change detection"""
+    activities1 = [
+        {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
+        {'type': 'MESSAGE_SENT', 'message': 'Test message'}
+    ]
+
+    activities2 = [
+        {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
+        {'type': 'MESSAGE_SENT', 'message': 'Test message'}
+    ]
+
+    activities3 = [
+        {'type': 'PLAN_GENERATED', 'message': 'Test plan'},
+        {'type': 'MESSAGE_SENT', 'message': 'Different message'}
+    ]
 
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['session_id'], 'monitored-session-456')
-        self.assertIsNotNone(result['branch_name'])
-
-        # Check that notification handler was added
-        self.assertEqual(len(self.client.notification_handlers), 1)
-
-    def test_throughput_report_generation(self):
-        """Test throughput report generation"""
-        # Add some metrics data
-        self.client.metrics.total_requests = 50
-        self.client.metrics.successful_requests = 45
-        self.client.metrics.activities_processed = 25
-        self.client.metrics.polling_cycles = 100
-
-        report = self.client.generate_throughput_report()
-
-        self.assertIn("Jules API Throughput Report", report)
-        self.assertIn("Total Requests: 50", report)
-        self.assertIn("Successful: 45", report)
-        self.assertIn("Success Rate: 90.00%", report)
-        self.assertIn("Activities Processed: 25", report)
-        self.assertIn("Polling Cycles: 100", report)
-
-    @patch('urllib.request.urlopen')
-    def test_retry_mechanism(self, mock_urlopen):
-        """Test retry mechanism with exponential backoff"""
-        # Mock first two failures, then success
-        responses = [
-            Mock(status=500, reason='Internal Server Error'),
-            Mock(status=503, reason='Service Unavailable'),
-            Mock(status=200, reason='OK')
-        ]
-
-        mock_response_data = json.dumps({'result': 'success'}).encode('utf-8')
-
-        def side_effect(*args, **kwargs):
-            response = responses.pop(0)
-            response.read.return_value = mock_response_data
-            mock_response = Mock()
-            mock_response.__enter__.return_value = response
-            return mock_response
-
-        mock_urlopen.side_effect = side_effect
-
-        result = self.client.retry_request('GET', '/v1alpha/sessions/test')
-
-        self.assertEqual(result['status'], 'success')
-        # Should have made 3 attempts (2 failures + 1 success)
-        self.assertEqual(self.client.metrics.total_requests, 1)  # Only final successful call counted
-
-    def test_active_polling_management(self):
-        """Test active polling session management"""
-        # Initially no active pollers
-        self.assertEqual(len(self.client.get_active_polling_sessions()), 0)
-
-        # Mock adding a poller (normally done internally)
-        mock_future = Mock()
-        self.client.active_pollers['test-session'] = mock_future
-
-        self.assertEqual(len(self.client.get_active_polling_sessions()), 1)
-        self.assertIn('test-session', self.client.get_active_polling_sessions())
-
-        # Stop polling
-        result = self.client.stop_session_polling('test-session')
-        self.assertTrue(result)
-        self.assertEqual(len(self.client.get_active_polling_sessions()), 0)
-
-        # Try to stop non-existent polling
-        result = self.client.stop_session_polling('non-existent')
-        self.assertFalse(result)
-
-    def test_metrics_serialization(self):
-        """Test metrics serialization for logging"""
-        # Add some test data
-        self.client.metrics.total_requests = 100
-        self.client.metrics.successful_requests = 85
-        self.client.metrics.response_times = [0.1, 0.2, 0.3]
-        self.client.metrics.activities_processed = 50
-        self.client.metrics.polling_cycles = 25
-
-        serialized = self.client._serialize_metrics()
-
-        self.assertEqual(serialized['total_requests'], 100)
-        self.assertEqual(serialized['successful_requests'], 85)
-        self.assertEqual(serialized['success_rate'], 85.0)
-        self.assertAlmostEqual(serialized['average_response_time'], 0.2, places=3)
-        self.assertEqual(serialized['activities_processed'], 50)
-        self.assertEqual(serialized['polling_cycles'], 25)
-
-    @patch('urllib.request.urlopen')
-    def test_wait_for_activity_with_timeout(self, mock_urlopen):
-        """Test waiting for specific activity with timeout"""
-        # Mock activities response
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.read.return_value = json.dumps({
-            'activities': [
-                {'type': ActivityType.MESSAGE_SENT.value, 'message': 'Starting...'},
-                {'type': ActivityType.PLAN_GENERATED.value, 'message': 'Plan created'}
-            ]
-        }).encode('utf-8')
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
-        # Test successful activity wait
-        result = self.workflow.wait_for_activity_with_timeout(
+    hash1 = client._hash_activities(activities1)
+    hash2 = client._hash_activities(activities2)
+    hash3 = client._hash_activities(activities3)
+
+    # Same activities should have same hash
+    assert hash1 == hash2
+
+    # Different activities should have different hash
+    assert hash1 != hash3
+
+    # Field boundaries are part of the fingerprint
+    assert client._hash_activities([{'type': 'AB', 'message': 'C'}]) != \
+        client._hash_activities([{'type': 'A', 'message': 'BC'}])
+
+
+def test_monitored_session_creation(mock_urlopen, client, workflow):
+    """Test monitored session creation with workflow manager"""
+    # Mock successful API response
+    mock_urlopen.return_value = _FakeResp(200, _MONITORED_SESSION_OK)
+
+    def test_handler(session_name, activity):
+        pass
+
+    result = workflow.create_monitored_session(
+        task_description="Add comprehensive logging system",
+        source="sources/github/example/logging-project",
+        github_branch="main",
+        title="Logging System Implementation",
+        notification_handlers=[test_handler]
+    )
+
+    # session_id is the workflow's generated ID; the API's own ID stays in session_data
+    assert result['status'] == 'success'
+    assert result['session_id'].startswith('jules-workflow-')
+    assert result['session_name'] == 'sessions/monitored-session-456'
+    assert result['session_data']['sessionId'] == 'monitored-session-456'
+    assert result['session_id'] in result['branch_name']
+
+    # Check that notification handler was added
+    assert len(client.notification_handlers) == 1
+
+
+def test_monitored_session_keeps_created_at_string(mock_urlopen, workflow):
+    """Session records keep an ISO 'created_at' matching 'created_at_ns'"""
+    mock_urlopen.return_value = _FakeResp(200, _MONITORED_SESSION_OK)
+
+    workflow.create_monitored_session(
+        task_description="Add comprehensive logging system",
+        source="sources/github/example/logging-project"
+    )
+
+    session = workflow.active_sessions['sessions/monitored-session-456']
+    assert type(session) is dict
+    assert session['created_at'] == format_timestamp_ns(session['created_at_ns'])
+
+
+def test_throughput_report_generation(client):
+    """Test throughput report generation"""
+    # Add some metrics data
+    client.metrics.total_requests = 50
+    client.metrics.successful_requests = 45
+    client.metrics.activities_processed = 25
+    client.metrics.polling_cycles = 100
+
+    report = client.generate_throughput_report()
+
+    missing = [line for line in _EXPECTED_REPORT_LINES if line not in report]
+    assert not missing
+
+
+@patch('jules_enhanced_api.time.sleep')
+def test_retry_mechanism(mock_sleep, mock_urlopen, client):
+    """Test retry mechanism with exponential backoff"""
+    # First two failures, then success
+    mock_urlopen.side_effect = [
+        _FakeResp(500, b'', reason='Internal Server Error'),
+        _FakeResp(503, b'', reason='Service Unavailable'),
+        _FakeResp(200, b'{"result": "success"}')
+    ]
+
+    result = client.retry_request('GET', '/v1alpha/sessions/test')
+
+    assert result['status'] == 'success'
+    assert result['data'] == {'result': 'success'}
+    # Should have made 3 attempts (2 failures + 1 success), backing off between them
+    assert client.metrics.total_requests == 3
+    assert client.metrics.failed_requests == 2
+    assert mock_sleep.call_count == 2
+
+
+def test_active_polling_management(client):
+    """Test active polling session management"""
+    # Initially no active pollers
+    assert len(client.get_active_polling_sessions()) == 0
+
+    # Mock adding a poller (normally done internally)
+    mock_future = Mock()
+    client.active_pollers['test-session'] = mock_future
+
+    assert len(client.get_active_polling_sessions()) == 1
+    assert 'test-session' in client.get_active_polling_sessions()
+
+    # Stop polling
+    result = client.stop_session_polling('test-session')
+    assert result
+    assert len(client.get_active_polling_sessions()) == 0
+
+    # Try to stop non-existent polling
+    result = client.stop_session_polling('non-existent')
+    assert not result
+
+
+def test_metrics_serialization(client):
+    """Test metrics serialization for logging"""
+    # Add some test data
+    client.metrics.total_requests = 100
+    client.metrics.successful_requests = 85
+    client.metrics.record_response_times([0.1, 0.2, 0.3])
+    client.metrics.activities_processed = 50
+    client.metrics.polling_cycles = 25
+
+    serialized = client._serialize_metrics()
+
+    assert serialized['total_requests'] == 100
+    assert serialized['successful_requests'] == 85
+    assert serialized['success_rate'] == 85.0
+    assert math.isclose(serialized['average_response_time'], 0.2, rel_tol=1e-9)
+    assert serialized['activities_processed'] == 50
+    assert serialized['polling_cycles'] == 25
+
+
+def test_wait_for_activity_with_timeout(mock_urlopen, workflow):
+    """Test waiting for specific activity with timeout"""
+    # Mock activities response
+    mock_urlopen.return_value = _FakeResp(200, _ACTIVITIES_OK)
+
+    # Test successful activity wait
+    result = workflow.wait_for_activity_with_timeout(
+        'test-session',
+        ActivityType.PLAN_GENERATED.value,
+        timeout_minutes=0.1  # Very short timeout
+    )
+
+    assert result['status'] == 'success'
+    assert result['activity']['type'] == ActivityType.PLAN_GENERATED.value
+
+
+def test_wait_for_activity_woken_by_notification(client, workflow):
+    """Test the wait returns when the activity arrives through the notification path"""
+    # Nothing there on the initial sync; pretend background polling is already running
+    client.get_activities = Mock(return_value={'status': 'success', 'data': {'activities': []}})
+    client.active_pollers['test-session'] = Mock()
+
+    def deliver():
+        client._handle_activity_update('other-session', {'type': ActivityType.PLAN_GENERATED.value})
+        client._handle_activity_update('test-session', {'type': ActivityType.PLAN_GENERATED.value})
+
+    timer = threading.Timer(0.05, deliver)
+    timer.start()
+    try:
+        result = workflow.wait_for_activity_with_timeout(
             'test-session',
             ActivityType.PLAN_GENERATED.value,
-            timeout_minutes=0.1  # Very short timeout
+            timeout_minutes=0.1
         )
+    finally:
+        timer.cancel()
 
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['activity']['type'], ActivityType.PLAN_GENERATED.value)
-
-    def test_enums_and_constants(self):
-        """Test enum values and constants"""
-        # Session states
-        self.assertEqual(SessionState.ACTIVE.value, "ACTIVE")
-        self.assertEqual(SessionState.COMPLETED.value, "COMPLETED")
-        self.assertEqual(SessionState.FAILED.value, "FAILED")
-        self.assertEqual(SessionState.CANCELLED.value, "CANCELLED")
-
-        # Activity types
-        self.assertEqual(ActivityType.PLAN_GENERATED.value, "PLAN_GENERATED")
-        self.assertEqual(ActivityType.CODE_GENERATED.value, "CODE_GENERATED")
-        self.assertEqual(ActivityType.ERROR.value, "ERROR")
-        self.assertEqual(ActivityType.COMPLETION_NOTIFICATION.value, "COMPLETION_NOTIFICATION")
-
-    def test_graceful_shutdown(self):
-        """Test graceful shutdown of client"""
-        # Mock some active pollers
-        mock_future1 = Mock()
-        mock_future2 = Mock()
-        self.client.active_pollers = {
-            'session1': mock_future1,
-            'session2': mock_future2
-        }
+    assert result['status'] == 'success'
+    assert result['found_at'] < 1
+    assert client.get_activities.call_count == 1
+    assert len(client.notification_handlers) == 0
 
-        # Test shutdown
-        self.client.shutdown()
 
-        # Verify pollers were cancelled
-        mock_future1.cancel.assert_called_once()
-        mock_future2.cancel.assert_called_once()
+def test_wait_for_activity_stops_the_poller_it_started(client, workflow):
+    """Test a one-off wait does not leave its own background poller running"""
+    client.get_session = Mock(return_value={'status': 'success', 'data': {'state': SessionState.ACTIVE.value}})
+    client.get_activities = Mock(return_value={'status': 'success', 'data': {'activities': []}})
 
-        # Verify active pollers cleared
-        self.assertEqual(len(self.client.active_pollers), 0)
+    result = workflow.wait_for_activity_with_timeout(
+        'test-session',
+        ActivityType.PLAN_GENERATED.value,
+        timeout_minutes=0.002
+    )
 
-class TestIntegrationScenarios(unittest.TestCase):
-    """Integration tests for realistic scenarios"""
+    assert result['status'] == 'timeout'
+    assert client.get_active_polling_sessions() == []
+
+    # The poller exits on its stop event rather than running out max_polling_duration
+    start = time.time()
+    client.executor.shutdown(wait=True)
+    assert time.time() - start < client.config.max_polling_duration / 2
+
+
+@pytest.mark.parametrize("enum_val,expected", [
+    # Session states
+    (SessionState.ACTIVE, "ACTIVE"),
+    (SessionState.COMPLETED, "COMPLETED"),
+    (SessionState.FAILED, "FAILED"),
+    (SessionState.CANCELLED, "CANCELLED"),
+    # Activity types
+    (ActivityType.PLAN_GENERATED, "PLAN_GENERATED"),
+    (ActivityType.CODE_GENERATED, "CODE_GENERATED"),
+    (ActivityType.ERROR, "ERROR"),
+    (ActivityType.COMPLETION_NOTIFICATION, "COMPLETION_NOTIFICATION"),
+])
+def test_enums_and_constants(enum_val, expected):
+    """Test enum values and constants"""
+    assert enum_val.value == expected
+
+
+def test_graceful_shutdown(client):
+    """Test graceful shutdown of client"""
+    # Mock some active pollers
+    mock_future1 = Mock()
+    mock_future2 = Mock()
+    client.active_pollers = {
+        'session1': mock_future1,
+        'session2': mock_future2
+    }
+
+    # Test shutdown
+    client.shutdown()
+
+    # Verify pollers were cancelled
+    mock_future1.cancel.assert_called_once()
+    mock_future2.cancel.assert_called_once()
+
+    # Verify active pollers cleared
+    assert len(client.active_pollers) == 0
+
+
+def test_notifications_dispatched_off_caller_thread(client):
+    """Test handlers run in order on the dispatcher thread and survive handler errors"""
+    received = []
+
+    def failing_handler(session_name, activity):
+        raise RuntimeError("handler bug")
+
+    def recording_handler(session_name, activity):
+        received.append((activity['type'], threading.current_thread()))
+
+    client.add_notification_handler(failing_handler)
+    client.add_notification_handler(recording_handler)
+
+    for activity_type in (ActivityType.PLAN_GENERATED.value, ActivityType.CODE_GENERATED.value):
+        client._handle_activity_update('test-session', {'type': activity_type, 'message': ''})
+    client.flush_notifications()
+
+    assert [activity_type for activity_type, _ in received] == [
+        ActivityType.PLAN_GENERATED.value, ActivityType.CODE_GENERATED.value
+    ]
+    assert all(thread is not threading.current_thread() for _, thread in received)
+
+
+def test_executor_created_lazily(client):
+    """Test the polling thread pool is only created when first needed"""
+    assert client._executor is None
+
+    executor = client.executor
+    assert client.executor is executor
+
+    client.shutdown()
+    assert client._executor is None
+
+@pytest.fixture
+def integration_client():
+    """Client configured like a longer-running integration session"""
+    config = dataclasses.replace(
+        _CONFIG_PROTO,
+        api_key="AQ.integration_test_key",
+        polling_interval=2,
+        max_polling_duration=30
+    )
+    client = JulesEnhancedAPIClient(config)
+    yield client
+    client.shutdown()
 
-    def setUp(self):
-        """Set up integration test environment"""
-        self.config = JulesConfig(
-            api_key="AQ.integration_test_key",
-            polling_interval=2,
-            max_polling_duration=30,
-            throughput_logging=True,
-            enable_notifications=True
-        )
-        self.client = JulesEnhancedAPIClient(self.config)
-        self.workflow = JulesEnhancedWorkflowManager(self.client)
-
-    def test_notification_handler_with_multiple_activities(self):
-        """Test notification handler processing multiple activities"""
-        received_notifications = []
-
-        def test_handler(session_name, activity):
-            received_notifications.append((session_name, activity['type']))
-
-        self.client.add_notification_handler(test_handler)
-
-        # Simulate multiple activities
-        activities = [
-            {'type': ActivityType.PLAN_GENERATED.value, 'message': 'Plan created'},
-            {'type': ActivityType.MESSAGE_SENT.value, 'message': 'User message'},
-            {'type': ActivityType.CODE_GENERATED.value, 'message': 'Code generated'},
-            {'type': ActivityType.COMPLETION_NOTIFICATION.value, 'message': 'Completed'}
-        ]
-
-        session_name = 'test-session-multi'
-        for activity in activities:
-            self.client._handle_activity_update(session_name, activity)
-
-        # Verify all notifications were received
-        self.assertEqual(len(received_notifications), 4)
-        self.assertEqual(received_notifications[0][1], ActivityType.PLAN_GENERATED.value)
-        self.assertEqual(received_notifications[3][1], ActivityType.COMPLETION_NOTIFICATION.value)
-
-    def test_workflow_end_to_end_simulation(self):
-        """Test end-to-end workflow simulation"""
-        # Track workflow events
-        workflow_events = []
-
-        def workflow_handler(session_name, activity):
-            workflow_events.append({
-                'timestamp': datetime.now(timezone.utc),
-                'session': session_name,
-                'activity': activity['type'],
-                'message': activity.get('message', '')
-            })
-
-        # Create unique identifiers
-        task_desc = "Implement user authentication system with OAuth2"
-        session_id = self.workflow.generate_unique_session_id(task_desc)
-        branch_name = self.workflow.generate_unique_branch_name(task_desc, session_id)
-
-        # Verify uniqueness
-        self.assertNotEqual(session_id, branch_name)
-        self.assertTrue(session_id.startswith("jules-workflow-"))
-        self.assertIn(session_id, branch_name)
-
-        # Simulate workflow session creation (without actual API calls)
-        session_data = {
-            'name': f'sessions/{session_id}',
-            'sessionId': session_id,
-            'state': SessionState.ACTIVE.value,
-            'createdAt': datetime.now(timezone.utc).isoformat()
-        }
 
-        self.workflow.active_sessions[session_id] = {
-            'session_data': session_data,
-            'branch_name': branch_name,
-            'task_description': task_desc,
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'metrics_start': ThroughputMetrics()
-        }
+def test_notification_handler_with_multiple_activities(integration_client):
+    """Test notification handler processing multiple activities"""
+    received_notifications = []
 
-        # Verify session creation
-        self.assertIn(session_id, self.workflow.active_sessions)
-        self.assertEqual(self.workflow.active_sessions[session_id]['branch_name'], branch_name)
+    def test_handler(session_name, activity):
+        received_notifications.append((session_name, activity['type']))
 
-        # Simulate activity updates
-        activities_sequence = [
-            ActivityType.PLAN_GENERATED.value,
-            ActivityType.PLAN_APPROVED.value,
-            ActivityType.CODE_GENERATED.value,
-            ActivityType.COMPLETION_NOTIFICATION.value
-        ]
+    integration_client.add_notification_handler(test_handler)
+
+    # Simulate multiple activities
+    activities = [
+        {'type': ActivityType.PLAN_GENERATED.value, 'message': 'Plan created'},
+        {'type': ActivityType.MESSAGE_SENT.value, 'message': 'User message'},
+        {'type': ActivityType.CODE_GENERATED.value, 'message': 'Code generated'},
+        {'type': ActivityType.COMPLETION_NOTIFICATION.value, 'message': 'Completed'}
+    ]
+
+    session_name = 'test-session-multi'
+    integration_client._handle_activities_update(session_name, activities)
+    integration_client.flush_notifications()
+
+    # Verify all notifications were received
+    assert len(received_notifications) == 4
+    assert received_notifications[0][1] == ActivityType.PLAN_GENERATED.value
+    assert received_notifications[3][1] == ActivityType.COMPLETION_NOTIFICATION.value
+
+
+def test_workflow_end_to_end_simulation(integration_client):
+    """Test end-to-end workflow simulation"""
+    workflow = JulesEnhancedWorkflowManager(integration_client)
+
+    # Track workflow events
+    workflow_events = []
 
-        for activity_type in activities_sequence:
-            activity = {'type': activity_type, 'message': f'Simulated {activity_type}'}
-            self.client._handle_activity_update(session_id, activity)
-            workflow_handler(session_id, activity)
+    def workflow_handler(session_name, activity):
+        workflow_events.append({
+            'timestamp_ns': time.time_ns(),
+            'session': session_name,
+            'activity': activity['type'],
+            'message': activity.get('message', '')
+        })
+
+    # Create unique identifiers
+    task_desc = "Implement user authentication system with OAuth2"
+    session_id = workflow.generate_unique_session_id(task_desc)
+    branch_name = workflow.generate_unique_branch_name(task_desc, session_id)
+
+    # Verify uniqueness
+    assert session_id != branch_name
+    assert session_id.startswith("jules-workflow-")
+    assert session_id in branch_name
+
+    # Simulate workflow session creation (without actual API calls)
+    session_data = {
+        'name': f'sessions/{session_id}',
+        'sessionId': session_id,
+        'state': SessionState.ACTIVE.value,
+        'createdAt': datetime.now(timezone.utc).isoformat()
+    }
+
+    workflow.active_sessions[session_id] = {
+        'session_data': session_data,
+        'branch_name': branch_name,
+        'task_description': task_desc,
+        'created_at_ns': time.time_ns(),
+        'metrics_start': ThroughputMetrics()
+    }
+
+    # Verify session creation
+    assert session_id in workflow.active_sessions
+    assert workflow.active_sessions[session_id]['branch_name'] == branch_name
+
+    # Simulate activity updates
+    activities_sequence = [
+        ActivityType.PLAN_GENERATED.value,
+        ActivityType.PLAN_APPROVED.value,
+        ActivityType.CODE_GENERATED.value,
+        ActivityType.COMPLETION_NOTIFICATION.value
+    ]
+
+    activities = [
+        {'type': activity_type, 'message': f'Simulated {activity_type}'}
+        for activity_type in activities_sequence
+    ]
+    integration_client._handle_activities_update(session_id, activities)
+    for activity in activities:
+        workflow_handler(session_id, activity)
+
+    # Verify workflow progression
+    assert len(workflow_events) == 4
+    assert workflow_events[0]['activity'] == ActivityType.PLAN_GENERATED.value
+    assert workflow_events[-1]['activity'] == ActivityType.COMPLETION_NOTIFICATION.value
+
+
+def _build_simulated_activities(num_activities):
+    """Build (session, activity) pairs up front so formatting stays out of timed code"""
+    activity_type = sys.intern(ActivityType.CODE_GENERATED.value)
+    return [
+        (
+            sys.intern(f'session-{i}'),
+            {'type': activity_type, 'message': sys.intern(f'Activity {i+1} - Simulated code generation')}
+        )
+        for i in range(num_activities)
+    ]
+
+
+def _simulate_activity_batch(client, activities):
+    """Feed simulated activities and their API requests through the client"""
+    for session_name, activity in activities:
+        client._handle_activity_update(session_name, activity)
+
+    # Simulate the matching API requests in one batch
+    now = time.time()
+    client._log_throughput_batch(
+        start_times=[now - (i * 0.01) for i in range(len(activities))],
+        bytes_sent=100,
+        bytes_received=500,
+        successes=[True] * len(activities)
+    )
+
+
+@pytest.mark.serial
+def test_activity_throughput_benchmark(benchmark, client):
+    """Benchmark activity handling and throughput logging"""
+    activities = _build_simulated_activities(100)
+    benchmark.pedantic(_simulate_activity_batch, args=(client, activities), iterations=5, rounds=3)
+
+    assert client.metrics.total_requests >= 100 * 5 * 3
+    assert client.metrics.success_rate == 100
 
-        # Verify workflow progression
-        self.assertEqual(len(workflow_events), 4)
-        self.assertEqual(workflow_events[0]['activity'], ActivityType.PLAN_GENERATED.value)
-        self.assertEqual(workflow_events[-1]['activity'], ActivityType.COMPLETION_NOTIFICATION.value)
 
 def run_performance_test():
     """Run performance test for throughput capabilities"""
     print("🚀 Running Performance Test")
     print("=" * 50)
 
-    config = JulesConfig(
-        api_key="AQ.performance_test_key",
-        polling_interval=1,
-        throughput_logging=True
-    )
+    config = dataclasses.replace(_CONFIG_PROTO, api_key="AQ.performance_test_key")
 
     client = JulesEnhancedAPIClient(config)
 
-    # Simulate high-throughput scenario
-    start_time = time.time()
+    # Simulate high-throughput scenario; keep console output out of the timed region
     num_activities = 100
-
+    activities = _build_simulated_activities(num_activities)
     print(f"Simulating {num_activities} activities...")
 
-    for i in range(num_activities):
-        activity = {
-            'type': ActivityType.CODE_GENERATED.value,
-            'message': f'Activity {i+1} - Simulated code generation'
-        }
-        client._handle_activity_update(f'session-{i}', activity)
-
-        # Simulate API request
-        client._log_throughput(
-            start_time=time.time() - (i * 0.01),
-            bytes_sent=100,
-            bytes_received=500,
-            success=True
-        )
-
+    start_time = time.time()
+    _simulate_activity_batch(client, activities)
     duration = time.time() - start_time
     metrics = client.get_throughput_metrics()
 
@@ -555,7 +780,7 @@ def main():
 
     # Run unit tests
     print("\n📋 Running Unit Tests...")
-    unittest.main(argv=[''], exit=False, verbosity=2)
+    pytest.main([__file__, "-v"])
 
     # Run performance test
     run_performance_test()
@@ -4,98 +4,243 @@ Test script for enhanced Jules MCP server with Request Pattern integration
 """
 
 import asyncio
+import json
 import os
 import sys
+import time
 import logging
 from pathlib import Path
 
+import pytest
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from jules_mcp.request_patterns import ExternalAPIManager, WebSearchManager, RequestPatternManager
+from jules_mcp.request_patterns import (
+    APIResponse, ExternalAPIManager, WebSearchManager, RequestPatternManager
+)
+
+logger = logging.getLogger(__name__)
+
+# GitHub repository responses are large and stable; reuse them for a day
+# unless JULES_TEST_LIVE=1 asks for fresh ones
+GITHUB_CACHE_TTL = 24 * 60 * 60
+GITHUB_CACHE_PATH = Path(__file__).parent / ".pytest_cache" / "jules_mcp" / "github_repos.json"
+
+
+class GitHubRepoCache:
+    """TTL cache of successful get_github_repo responses, in memory and on disk"""
+
+    def __init__(self, path: Path = GITHUB_CACHE_PATH, ttl: float = GITHUB_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._memory = {}
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, owner: str, repo: str):
+        """Return cached repository data, or None if missing or expired"""
+        key = f"{owner}/{repo}"
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self._load().get(key)
+        if entry is None or time.time() - entry["fetched_at"] > self.ttl:
+            self._memory.pop(key, None)
+            return None
+        self._memory[key] = entry
+        return entry["data"]
+
+    def put(self, owner: str, repo: str, data: dict):
+        """Store repository data in both tiers"""
+        key = f"{owner}/{repo}"
+        entry = {"fetched_at": time.time(), "data": data}
+        self._memory[key] = entry
+        entries = self._load()
+        entries[key] = entry
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(entries))
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write GitHub cache: {e}")
+
+    def wrap(self, api_manager: ExternalAPIManager) -> ExternalAPIManager:
+        """Serve api_manager.get_github_repo from this cache where possible"""
+        fetch = api_manager.get_github_repo
+
+        async def get_github_repo(owner: str, repo: str) -> APIResponse:
+            data = self.get(owner, repo)
+            if data is not None:
+                return APIResponse(success=True, data=data, status=200)
+            result = await fetch(owner, repo)
+            if result.success:
+                self.put(owner, repo, result.data)
+            return result
+
+        api_manager.get_github_repo = get_github_repo
+        return api_manager
+
+
+_github_cache = GitHubRepoCache()
+
+
+class AsyncLimiter:
+    """Token bucket allowing `rate` acquisitions per `per` seconds
+
+    Refills from loop.time() arithmetic on each acquire, so callers under
+    the rate never schedule a timer; only an empty bucket sleeps.
+    """
+
+    def __init__(self, rate: float = 10, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._last = None
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self._last is not None:
+                self._tokens = min(
+                    self.rate, self._tokens + (now - self._last) * self.rate / self.per
+                )
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+# One connection pool reused by the network tests; each test builds its own
+# manager on top, so circuit breaker and rate limiter state stays per test
+_pool_owner = None
+
+
+def shared_http_client():
+    """Return the pooled HTTP client shared across tests, creating it on first use"""
+    global _pool_owner
+    if _pool_owner is None:
+        _pool_owner = ExternalAPIManager()
+    return _pool_owner.client
+
+
+def new_api_manager(**kwargs) -> ExternalAPIManager:
+    """Fresh ExternalAPIManager on the shared pool, serving GitHub repos from the cache"""
+    api_manager = ExternalAPIManager(http_client=shared_http_client(), **kwargs)
+    if os.environ.get("JULES_TEST_LIVE") != "1":
+        _github_cache.wrap(api_manager)
+    return api_manager
+
+
+async def close_shared_http_client():
+    """Close the shared pool; its client is bound to the current event loop"""
+    global _pool_owner
+    if _pool_owner is not None:
+        await _pool_owner.close()
+        _pool_owner = None
+
+
+# Rate limiting (GitHub answers 403) and gateway errors say nothing about this code
+_UNAVAILABLE_STATUSES = frozenset({403, 429, 502, 503, 504})
+
+
+def require_service(result: APIResponse) -> APIResponse:
+    """Skip the calling test when the remote service could not be reached"""
+    if not result.success and (result.status is None or result.status in _UNAVAILABLE_STATUSES):
+        pytest.skip(f"External service unavailable: {result.error}")
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
+async def shared_http_client_lifecycle():
+    """Close the shared pool once this module's tests have run"""
+    yield
+    await close_shared_http_client()
 
 
 async def test_web_search():
     """Test web search capabilities"""
-    print("🔍 Testing Web Search...")
+    logger.info("🔍 Testing Web Search...")
 
     search_manager = WebSearchManager()
 
     # Test 1: Basic search
-    result = await search_manager.perform_web_search("Python async programming best practices")
+    query = "Python async programming best practices"
+    result = require_service(await search_manager.perform_web_search(query))
 
-    if result.success:
-        print(f"✅ Web search successful: {result.data['count']} results found")
-        print(f"   Query: {result.data['query']}")
-        if result.data['results']:
-            print(f"   First result: {result.data['results'][0]['title']}")
-    else:
-        print(f"❌ Web search failed: {result.error}")
-
-    return result.success
+    assert result.success, result.error
+    assert result.data['query'] == query
+    assert result.data['count'] == len(result.data['results'])
+    logger.info(f"✅ Web search successful: {result.data['count']} results found")
+    if result.data['results']:
+        logger.info(f"   First result: {result.data['results'][0]['title']}")
 
 async def test_code_example_search():
     """Test code example search"""
-    print("\n💻 Testing Code Example Search...")
+    logger.info("\n💻 Testing Code Example Search...")
 
     search_manager = WebSearchManager()
 
-    result = await search_manager.search_code_examples("React hooks useState")
-
-    if result.success:
-        print(f"✅ Code search successful: {result.data['total_results']} total results")
-        print(f"   Code examples found: {len(result.data['code_examples'])}")
-        print(f"   Recommended examples: {len(result.data['recommended'])}")
-    else:
-        print(f"❌ Code search failed: {result.error}")
+    result = require_service(await search_manager.search_code_examples("React hooks useState"))
 
-    return result.success
+    assert result.success, result.error
+    assert result.data['recommended'] == result.data['code_examples'][:3]
+    logger.info(f"✅ Code search successful: {result.data['total_results']} total results")
+    logger.info(f"   Code examples found: {len(result.data['code_examples'])}")
 
 async def test_github_api():
     """Test GitHub API integration"""
-    print("\n🐙 Testing GitHub API...")
+    logger.info("\n🐙 Testing GitHub API...")
 
-    api_manager = ExternalAPIManager()
+    api_manager = new_api_manager()
 
     # Test with a well-known repository
-    result = await api_manager.get_github_repo("microsoft", "vscode")
+    result = require_service(await api_manager.get_github_repo("microsoft", "vscode"))
 
-    if result.success:
-        repo = result.data
-        print(f"✅ GitHub API successful")
-        print(f"   Repository: {repo['full_name']}")
-        print(f"   Stars: {repo['stargazers_count']}")
-        print(f"   Language: {repo['language']}")
-        print(f"   Description: {repo['description'][:80]}...")
-    else:
-        print(f"❌ GitHub API failed: {result.error}")
-
-    return result.success
+    assert result.success, result.error
+    repo = result.data
+    assert repo['full_name'] == "microsoft/vscode"
+    assert repo['stargazers_count'] > 0
+    logger.info(f"✅ GitHub API successful")
+    logger.info(f"   Stars: {repo['stargazers_count']}")
+    logger.info(f"   Language: {repo['language']}")
 
 async def test_repository_research():
     """Test full repository research"""
-    print("\n🔬 Testing Repository Research...")
-
-    request_manager = RequestPatternManager()
+    logger.info("\n🔬 Testing Repository Research...")
 
-    result = await request_manager.research_github_repository("https://github.com/facebook/react")
+    request_manager = RequestPatternManager(api_manager=new_api_manager())
 
-    if result.success:
-        data = result.data
-        print(f"✅ Repository research successful")
-        print(f"   Repository: {data['repository']['full_name']}")
-        print(f"   Implementation patterns: {data['implementation_patterns']}")
-        print(f"   Recent commits: {len(data['recent_commits'])}")
-    else:
-        print(f"❌ Repository research failed: {result.error}")
+    result = require_service(
+        await request_manager.research_github_repository("https://github.com/facebook/react")
+    )
 
-    return result.success
+    assert result.success, result.error
+    data = result.data
+    assert data['repository']['full_name'] == "facebook/react"
+    assert data['implementation_patterns']
+    logger.info(f"✅ Repository research successful")
+    logger.info(f"   Implementation patterns: {data['implementation_patterns']}")
+    logger.info(f"   Recent commits: {len(data['recent_commits'])}")
 
 async def test_dependency_validation():
     """Test dependency validation"""
-    print("\n🔗 Testing Dependency Validation...")
+    logger.info("\n🔗 Testing Dependency Validation...")
 
-    request_manager = RequestPatternManager()
+    request_manager = RequestPatternManager(api_manager=new_api_manager())
 
     dependencies = [
         {
@@ -111,203 +256,114 @@ async def test_dependency_validation():
 
     result = await request_manager.validate_external_dependencies(dependencies)
 
-    if result.success:
-        data = result.data
-        print(f"✅ Dependency validation successful")
-        print(f"   Total dependencies: {data['total_dependencies']}")
-        print(f"   Available: {data['available']}")
-        print(f"   Failed: {data['failed']}")
-    else:
-        print(f"❌ Dependency validation failed: {result.error}")
-
-    return result.success
+    # Unreachable dependencies are reported as failed, not raised
+    assert result.success, result.error
+    data = result.data
+    assert data['total_dependencies'] == 2
+    assert data['available'] + data['failed'] == 2
+    assert [detail['dependency'] for detail in data['details']] == dependencies
+    logger.info(f"✅ Dependency validation successful")
+    logger.info(f"   Available: {data['available']}")
+    logger.info(f"   Failed: {data['failed']}")
 
 async def test_rate_limiting():
     """Test rate limiting functionality"""
-    print("\n⏱️ Testing Rate Limiting...")
+    logger.info("\n⏱️ Testing Rate Limiting...")
+
+    api_manager = new_api_manager()
 
-    api_manager = ExternalAPIManager()
+    # Two tokens per half second, so the third request has to wait for a refill
+    limiter = AsyncLimiter(rate=2, per=0.5)
+    loop = asyncio.get_running_loop()
+    started = []
+
+    async def limited_request():
+        async with limiter:
+            started.append(loop.time())
+            return await api_manager.call_external_api(
+                'GET',
+                'https://httpbin.org/status/200',
+                service_name="test_service"
+            )
 
     # Make multiple requests to test rate limiting
-    success_count = 0
-    for i in range(3):
-        result = await api_manager.call_external_api(
-            'GET',
-            'https://httpbin.org/status/200',
-            service_name="test_service"
-        )
-        if result.success:
-            success_count += 1
-        await asyncio.sleep(0.1)
-
-    print(f"✅ Rate limiting test: {success_count}/3 requests successful")
-    return success_count >= 2  # At least 2 should succeed
+    first = loop.time()
+    results = await asyncio.gather(*(limited_request() for _ in range(3)))
+    started.sort()
+    assert started[1] - first < 0.1
+    assert started[2] - first >= 0.2
+
+    for result in results:
+        require_service(result)
+    success_count = sum(result.success for result in results)
+
+    logger.info(f"✅ Rate limiting test: {success_count}/3 requests successful")
+    assert success_count >= 2  # At least 2 should succeed
 
 async def test_retry_logic():
     """Test retry logic with a failing endpoint"""
-    print("\n🔄 Testing Retry Logic...")
+    logger.info("\n🔄 Testing Retry Logic...")
 
-    api_manager = ExternalAPIManager(max_retries=2, base_delay=0.5)
+    api_manager = new_api_manager(max_retries=2, base_delay=0.5)
 
-    # Test with a 500 error endpoint (should retry)
+    # Test with a 500 error endpoint (should retry, then give up)
     result = await api_manager.call_external_api(
         'GET',
         'https://httpbin.org/status/500',
         timeout=5
     )
+    if result.status is None:
+        pytest.skip(f"External service unavailable: {result.error}")
 
-    # This should fail after retries, but we verify it attempted retries
-    print(f"✅ Retry logic test completed")
-    print(f"   Final status: {result.status}")
-    print(f"   Success: {result.success}")
-
-    return True  # Test passes if it completes without hanging
+    assert not result.success
+    assert result.status == 500
+    logger.info(f"✅ Retry logic test completed with status {result.status}")
 
 async def test_error_handling():
     """Test error handling for various scenarios"""
-    print("\n⚠️ Testing Error Handling...")
-
-    api_manager = ExternalAPIManager()
-
-    # Test invalid URL
-    result1 = await api_manager.call_external_api('GET', 'invalid-url')
-    print(f"   Invalid URL handled: {'✅' if not result1.success else '❌'}")
-
-    # Test timeout
-    result2 = await api_manager.call_external_api('GET', 'https://httpbin.org/delay/10', timeout=2)
-    print(f"   Timeout handled: {'✅' if not result2.success else '❌'}")
-
-    # Test 404 handling
-    result3 = await api_manager.call_external_api('GET', 'https://httpbin.org/status/404')
-    print(f"   404 handled: {'✅' if result3.status == 404 else '❌'}")
-
-    return True
-
-async def run_all_tests():
-    """Run all tests and report results"""
-    print("🧪 Running Enhanced Jules MCP Server Tests\n")
-
-    tests = [
-        ("Web Search", test_web_search),
-        ("Code Example Search", test_code_example_search),
-        ("GitHub API", test_github_api),
-        ("Repository Research", test_repository_research),
-        ("Dependency Validation", test_dependency_validation),
-        ("Rate Limiting", test_rate_limiting),
-        ("Retry Logic", test_retry_logic),
-        ("Error Handling", test_error_handling),
-    ]
-
-    results = []
-
-    for test_name, test_func in tests:
-        try:
-            success = await test_func()
-            results.append((test_name, success))
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
+    logger.info("\n⚠️ Testing Error Handling...")
 
-    # Summary
-    print("\n" + "="*60)
-    print("📊 TEST SUMMARY")
-    print("="*60)
+    api_manager = new_api_manager()
 
-    passed = sum(1 for _, success in results if success)
-    total = len(results)
-
-    for test_name, success in results:
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-
-    print(f"\nResults: {passed}/{total} tests passed")
+    # Invalid URL, timeout and 404 cases are independent, so overlap them
+    result1, result2, result3 = await asyncio.gather(
+        api_manager.call_external_api('GET', 'invalid-url'),
+        api_manager.call_external_api('GET', 'https://httpbin.org/delay/10', timeout=2),
+        api_manager.call_external_api('GET', 'https://httpbin.org/status/404'),
+    )
 
-    if passed == total:
-        print("🎉 All tests passed! Enhanced Jules MCP server is ready.")
-    elif passed >= total * 0.8:
-        print("⚠️ Most tests passed. Server should be functional with some limitations.")
-    else:
-        print("❌ Many tests failed. Please check the configuration and network access.")
+    assert not result1.success
+    assert result1.error == "Invalid URL format"
+    assert not result2.success
+    assert result2.status is None
 
-    return passed == total
+    require_service(result3)
+    assert result3.status == 404
 
 async def test_jules_api_integration():
     """Test Jules API integration with provided key"""
-    print("\n🤖 Testing Jules API Integration...")
+    logger.info("\n🤖 Testing Jules API Integration...")
 
     # Set the provided API key
     api_key = "AQ.Ab8RN6KhLDeWFveqNleyX6CQRvs2LphwdDzCda5W2t_Y9HU0Uw"
 
     if not api_key:
-        print("❌ No Jules API key provided")
-        return False
-
-    try:
-        # Import here to avoid issues if jules_client has dependencies
-        from jules_mcp.jules_client import JulesAPIClient
-
-        client = JulesAPIClient(
-            api_key=api_key,
-            base_url="https://jules.googleapis.com",
-            api_version="v1alpha"
-        )
-
-        # Test basic API connectivity
-        print("   Testing API connectivity...")
+        pytest.skip("No Jules API key provided")
 
-        # We can't actually create a session without a proper GitHub source
-        # but we can test if the client initializes properly
-        print(f"✅ Jules API client initialized successfully")
-        print(f"   API Key: {api_key[:20]}...")
-        print(f"   Base URL: {client.base_url}")
-        print(f"   API Version: v1alpha")
+    from jules_mcp.jules_client import JulesAPIClient
 
-        await client.close()
-        return True
-
-    except ImportError as e:
-        print(f"❌ Jules client import failed: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Jules API test failed: {e}")
-        return False
-
-async def main():
-    """Main test runner"""
-    # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s"
+    client = JulesAPIClient(
+        api_key=api_key,
+        base_url="https://jules.googleapis.com",
+        api_version="v1alpha"
     )
 
-    print("🚀 Enhanced Jules MCP Server Test Suite")
-    print("="*60)
-
-    # Test Request Pattern capabilities first
-    rp_success = await run_all_tests()
-
-    # Test Jules API integration
-    jules_success = await test_jules_api_integration()
-
-    # Final summary
-    print("\n" + "="*60)
-    print("🏁 FINAL RESULTS")
-    print("="*60)
-    print(f"Request Pattern Tests: {'✅ PASS' if rp_success else '❌ FAIL'}")
-    print(f"Jules API Integration: {'✅ PASS' if jules_success else '❌ FAIL'}")
-
-    if rp_success and jules_success:
-        print("\n🎉 ALL TESTS PASSED!")
-        print("✨ Enhanced Jules MCP server is ready for production use!")
-        print("\nNext steps:")
-        print("1. Set JULES_API_KEY environment variable")
-        print("2. Start the MCP server: python -m src.jules_mcp.server")
-        print("3. Connect your MCP client to use enhanced features")
-    else:
-        print("\n⚠️ Some tests failed.")
-        print("Please review the errors above and check configuration.")
-
-    return rp_success and jules_success
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # We can't actually create a session without a proper GitHub source
+    # but we can test if the client initializes properly
+    try:
+        assert client.api_key == api_key
+        assert client.base_url == "https://jules.googleapis.com/v1alpha"
+        logger.info(f"✅ Jules API client initialized successfully")
+        logger.info(f"   Base URL: {client.base_url}")
+    finally:
+        await client.close()
@@ -3,176 +3,95 @@
 Final validation of Jules MCP Server functionality
 """
 
-import os
 import sys
-import asyncio
+import logging
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-async def test_final_mcp_validation():
+logger = logging.getLogger(__name__)
+
+# Expected tool names
+EXPECTED_TOOLS = frozenset({
+    "jules_create_worker",
+    "jules_send_message",
+    "jules_approve_plan",
+    "jules_cancel_session",
+    "jules_get_activities"
+})
+
+# Expected resource templates
+EXPECTED_RESOURCES = frozenset({
+    "worker://{session_id}/status",
+    "workers://all",
+    "worker://{session_id}/activities"
+})
+
+# Expected prompts
+EXPECTED_PROMPTS = frozenset({
+    "delegate_task",
+    "review_plan"
+})
+
+async def _resource_uris(mcp):
+    """URIs of static resources and templated ones; workers://all takes no parameters"""
+    resources = await mcp.list_resources()
+    templates = await mcp.list_resource_templates()
+    return {str(resource.uri) for resource in resources} | {
+        template.uriTemplate for template in templates
+    }
+
+async def test_final_mcp_validation(mcp):
     """Complete final validation of Jules MCP server"""
-    print("🎯 Final Jules MCP Server Validation")
-    print("=" * 60)
-
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key_for_validation"
-
-    try:
-        from jules_mcp.server import mcp
-
-        print("\n✅ 1. Server Initialization")
-        print(f"    - Server Type: {type(mcp).__name__}")
-        print(f"    - Server Name: {getattr(mcp, 'name', 'Unknown')}")
-
-        print("\n✅ 2. MCP Protocol Structure")
-        print(f"    - Tool Manager: {hasattr(mcp, '_tool_manager')}")
-        print(f"    - Resource Manager: {hasattr(mcp, '_resource_manager')}")
-        print(f"    - Prompt Manager: {hasattr(mcp, '_prompt_manager')}")
-
-        print("\n✅ 3. MCP Tools Available")
-        tools = await mcp.list_tools()
-        if isinstance(tools, list):
-            tool_count = len(tools)
-            print(f"    - Tools Count: {tool_count}")
-            for tool in tools:
-                tool_name = getattr(tool, 'name', 'Unknown')
-                tool_desc = getattr(tool, 'description', 'No description')
-                print(f"      🛠️  {tool_name}: {tool_desc[:50]}...")
-        else:
-            print(f"    - Tools: {tools}")
-
-        print("\n✅ 4. MCP Resources Available")
-        resources = await mcp.list_resource_templates()
-        if isinstance(resources, list):
-            resource_count = len(resources)
-            print(f"    - Resources Count: {resource_count}")
-            for resource in resources:
-                resource_name = getattr(resource, 'name', 'Unknown')
-                resource_uri = getattr(resource, 'uriTemplate', 'Unknown')
-                print(f"      📁 {resource_name}: {resource_uri}")
-        else:
-            print(f"    - Resources: {resources}")
-
-        print("\n✅ 5. MCP Prompts Available")
-        prompts = await mcp.list_prompts()
-        if isinstance(prompts, list):
-            prompt_count = len(prompts)
-            print(f"    - Prompts Count: {prompt_count}")
-            for prompt in prompts:
-                prompt_name = getattr(prompt, 'name', 'Unknown')
-                prompt_desc = getattr(prompt, 'description', 'No description')
-                print(f"      💬 {prompt_name}: {prompt_desc[:50]}...")
-        else:
-            print(f"    - Prompts: {prompts}")
-
-        print("\n✅ 6. Tool Functionality Test")
-        try:
-            # Test tool calling structure (will fail but validates protocol)
-            result = await mcp.call_tool(
-                "jules_create_worker",
-                {
-                    "task_description": "Test task for validation",
-                    "source": "sources/github/test/repo",
-                    "title": "Validation Test"
-                }
-            )
-
-            # Check result structure
-            if hasattr(result, '__iter__') and not isinstance(result, str):
-                result_content = list(result)[0] if result else None
-            else:
-                result_content = result
-
-            print(f"    - Tool Call: SUCCESS")
-            print(f"    - Result Type: {type(result_content)}")
-            print(f"    - Result Structure: Valid MCP response")
-
-        except Exception as e:
-            print(f"    - Tool Call: FAILED (Expected)")
-            print(f"    - Error Type: {type(e).__name__}")
-            print(f"    - Error Message: {str(e)[:100]}...")
-
-        print("\n✅ 7. Expected Components Validation")
-
-        # Expected tool names
-        expected_tools = [
-            "jules_create_worker",
-            "jules_send_message",
-            "jules_approve_plan",
-            "jules_cancel_session",
-            "jules_get_activities"
-        ]
-
-        # Expected resource templates
-        expected_resources = [
-            "worker://{session_id}/status",
-            "workers://all",
-            "worker://{session_id}/activities"
-        ]
-
-        # Expected prompts
-        expected_prompts = [
-            "delegate_task",
-            "review_plan"
-        ]
-
-        print(f"    - Expected Tools: {len(expected_tools)}")
-        print(f"    - Expected Resources: {len(expected_resources)}")
-        print(f"    - Expected Prompts: {len(expected_prompts)}")
-
-        return True
-
-    except Exception as e:
-        print(f"❌ Final validation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
-
-def test_production_readiness():
+    logger.info("🎯 Final Jules MCP Server Validation")
+
+    logger.info(f"✅ Server: {type(mcp).__name__} {getattr(mcp, 'name', 'Unknown')}")
+    assert hasattr(mcp, '_tool_manager')
+    assert hasattr(mcp, '_resource_manager')
+    assert hasattr(mcp, '_prompt_manager')
+
+    tools = await mcp.list_tools()
+    for tool in tools:
+        logger.info(f"      🛠️  {tool.name}: {(tool.description or '')[:50]}...")
+
+    resource_uris = await _resource_uris(mcp)
+    for uri in sorted(resource_uris):
+        logger.info(f"      📁 {uri}")
+
+    prompts = await mcp.list_prompts()
+    for prompt in prompts:
+        logger.info(f"      💬 {prompt.name}: {(prompt.description or '')[:50]}...")
+
+    # Compare by set difference rather than scanning the listings per name
+    assert not EXPECTED_TOOLS - {tool.name for tool in tools}
+    assert not EXPECTED_RESOURCES - resource_uris
+    assert not EXPECTED_PROMPTS - {prompt.name for prompt in prompts}
+
+    # Without an initialized worker manager the tool reports an error in its
+    # result rather than raising, which still exercises the calling protocol
+    result = await mcp.call_tool(
+        "jules_create_worker",
+        {
+            "task_description": "Test task for validation",
+            "source": "sources/github/test/repo",
+            "title": "Validation Test"
+        }
+    )
+    assert result
+    logger.info(f"    - Tool Call Result: {type(result).__name__}")
+
+async def test_production_readiness(mcp):
     """Test if the server is ready for production"""
-    print("\n🚀 Production Readiness Check")
-
-    checks = [
-        ("Module imports correctly", True),  # From previous tests
-        ("MCP server initializes", True),   # From this test
-        ("All tools registered", True),     # From this test
-        ("Tool calling structure works", True),  # From this test
-        ("Error handling functional", True),  # From this test
-        ("Environment configuration works", True),  # From previous tests
-    ]
-
-    passed = sum(1 for _, result in checks if result)
-    total = len(checks)
-
-    print(f"\nReadiness Score: {passed}/{total} ({passed/total*100:.1f}%)")
-
-    if passed == total:
-        print("🎉 PRODUCTION READY!")
-        print("✅ Jules MCP Server is fully functional")
-        print("📋 Ready for MCP client connections")
-        print("🔧 All 5 tools, 3 resources, and 2 prompts available")
-        return True
-    else:
-        print("❌ NOT production ready")
-        return False
-
-async def main():
-    """Run final validation"""
-    success = await test_final_mcp_validation()
-
-    if success:
-        production_ready = test_production_readiness()
-        return 0 if production_ready else 1
-    else:
-        print("\n❌ Final validation failed - server not ready")
-        return 1
-
-if __name__ == "__main__":
-    exit_code = asyncio.run(main())
-    sys.exit(exit_code)
\ No newline at end of file
+    logger.info("\n🚀 Production Readiness Check")
+
+    tools = await mcp.list_tools()
+    resource_uris = await _resource_uris(mcp)
+    prompts = await mcp.list_prompts()
+
+    logger.info(
+        f"Tools: {len(tools)}, Resources: {len(resource_uris)}, Prompts: {len(prompts)}"
+    )
+    assert len(tools) >= len(EXPECTED_TOOLS)
+    assert len(resource_uris) >= len(EXPECTED_RESOURCES)
+    assert len(prompts) >= len(EXPECTED_PROMPTS)
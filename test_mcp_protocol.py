@@ -3,187 +3,57 @@
 Test MCP protocol functionality and tool listing
 """
 
-import os
 import sys
-import asyncio
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-async def test_mcp_tool_listing():
+async def test_mcp_tool_listing(mcp):
     """Test MCP tool listing functionality"""
-    print("🔧 Testing MCP tool listing...")
+    tools = await mcp.list_tools()
+    assert tools
 
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key"
+    for tool in tools:
+        assert tool.name
+        assert tool.description
 
-    try:
-        from jules_mcp.server import mcp
+        # Every tool takes arguments, so each needs an object input schema
+        assert tool.inputSchema.get('type') == 'object'
+        properties = tool.inputSchema.get('properties', {})
+        assert set(tool.inputSchema.get('required', [])) <= set(properties)
 
-        # Test listing tools
-        tools = await mcp.list_tools()
-        print(f"  ✅ MCP Tools count: {len(tools.tools)}")
-
-        for tool in tools.tools:
-            print(f"    🛠️  {tool.name}: {tool.description[:100]}...")
-
-            # Check tool input schema
-            if hasattr(tool, 'inputSchema') and tool.inputSchema:
-                properties = tool.inputSchema.get('properties', {})
-                required = tool.inputSchema.get('required', [])
-                print(f"       Parameters: {list(properties.keys())}")
-                print(f"       Required: {required}")
-
-        return True
-    except Exception as e:
-        print(f"  ❌ MCP tool listing failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
-
-async def test_mcp_resource_listing():
+async def test_mcp_resource_listing(mcp):
     """Test MCP resource listing functionality"""
-    print("🔧 Testing MCP resource listing...")
-
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key"
-
-    try:
-        from jules_mcp.server import mcp
-
-        # Test listing resource templates
-        resources = await mcp.list_resource_templates()
-        print(f"  ✅ MCP Resources count: {len(resources.resources)}")
+    resources = await mcp.list_resources()
+    templates = await mcp.list_resource_templates()
 
-        for resource in resources.resources:
-            print(f"    📁 {resource.uriTemplate}: {resource.name}")
-            if hasattr(resource, 'description') and resource.description:
-                print(f"       {resource.description[:100]}...")
+    assert {str(resource.uri) for resource in resources} >= {"workers://all"}
+    for template in templates:
+        assert template.name
+        assert "{session_id}" in template.uriTemplate
 
-        return True
-    except Exception as e:
-        print(f"  ❌ MCP resource listing failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
-
-async def test_mcp_prompt_listing():
+async def test_mcp_prompt_listing(mcp):
     """Test MCP prompt listing functionality"""
-    print("🔧 Testing MCP prompt listing...")
-
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key"
-
-    try:
-        from jules_mcp.server import mcp
-
-        # Test listing prompts
-        prompts = await mcp.list_prompts()
-        print(f"  ✅ MCP Prompts count: {len(prompts.prompts)}")
-
-        for prompt in prompts.prompts:
-            print(f"    💬 {prompt.name}: {prompt.description[:100]}...")
-
-            # Check prompt arguments
-            if hasattr(prompt, 'arguments') and prompt.arguments:
-                args = [f"{arg.name}:{arg.description}" for arg in prompt.arguments]
-                print(f"       Arguments: {args}")
-
-        return True
-    except Exception as e:
-        print(f"  ❌ MCP prompt listing failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
-
-async def test_mcp_tool_calling():
-    """Test calling an MCP tool (will fail without real API but should validate structure)"""
-    print("🔧 Testing MCP tool calling...")
-
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key"
-
-    try:
-        from jules_mcp.server import mcp
-
-        # Try to call jules_create_worker (will fail but should validate structure)
-        try:
-            result = await mcp.call_tool(
-                "jules_create_worker",
-                {
-                    "task_description": "Test task",
-                    "source": "sources/github/test/repo",
-                    "title": "Test session"
-                }
-            )
-            print(f"  ✅ Tool call succeeded: {result}")
-        except Exception as call_error:
-            # Expected to fail since we don't have real API credentials
-            print(f"  ✅ Tool call structure validated (failed as expected): {type(call_error).__name__}")
-            print(f"       Error: {str(call_error)[:100]}...")
-
-        return True
-    except Exception as e:
-        print(f"  ❌ MCP tool calling test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
-
-async def main():
-    """Run MCP protocol tests"""
-    print("🚀 Jules MCP Server Protocol Test")
-    print("=" * 50)
-
-    tests = [
-        ("MCP Tool Listing", test_mcp_tool_listing),
-        ("MCP Resource Listing", test_mcp_resource_listing),
-        ("MCP Prompt Listing", test_mcp_prompt_listing),
-        ("MCP Tool Calling", test_mcp_tool_calling),
-    ]
-
-    passed = 0
-    total = len(tests)
-
-    for test_name, test_func in tests:
-        print(f"\n{test_name}:")
-        try:
-            result = await test_func()
-            if result:
-                print(f"  ✅ {test_name} PASSED")
-                passed += 1
-            else:
-                print(f"  ❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"  ❌ {test_name} ERROR: {e}")
-
-    print("\n" + "=" * 50)
-    print(f"Protocol Test Results: {passed}/{total} tests passed")
-
-    if passed == total:
-        print("🎉 All MCP protocol tests PASSED!")
-        print("✅ Jules MCP Server is fully MCP compliant")
-        print("📋 Ready for production use")
-        return 0
-    else:
-        print("❌ Some MCP protocol tests FAILED")
-        return 1
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    prompts = await mcp.list_prompts()
+    assert prompts
+
+    for prompt in prompts:
+        assert prompt.name
+        assert prompt.description
+        for arg in prompt.arguments or []:
+            assert arg.name
+
+async def test_mcp_tool_calling(mcp):
+    """Test calling an MCP tool (fails without a real API, but must return a result)"""
+    # The worker manager isn't initialized, so the tool reports the failure
+    # in its result rather than raising
+    result = await mcp.call_tool(
+        "jules_create_worker",
+        {
+            "task_description": "Test task",
+            "source": "sources/github/test/repo",
+            "title": "Test session"
+        }
+    )
+    assert result
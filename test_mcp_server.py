@@ -9,6 +9,8 @@ import asyncio
 import logging
 from pathlib import Path
 
+import pytest
+
 # Set environment variables
 os.environ['JULES_API_KEY'] = 'AQ.Ab8RN6KhLDeWFveqNleyX6CQRvs2LphwdDzCda5W2t_Y9HU0Uw'
 os.environ['JULES_API_BASE_URL'] = 'https://jules.googleapis.com'
@@ -17,45 +19,23 @@ os.environ['JULES_API_VERSION'] = 'v1alpha'
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from jules_mcp.request_patterns import request_manager
+from jules_mcp.request_patterns import RequestPatternManager
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def test_mcp_tools():
-    """Test all MCP tools that don't require Jules sessions"""
 
-    print("🧪 Testing MCP Server Tools")
-    print("=" * 50)
+@pytest.fixture
+async def request_manager():
+    """Private RequestPatternManager, so breaker state is not shared with other tests"""
+    manager = RequestPatternManager()
+    yield manager
+    await manager.close()
 
-    # Test 1: jules_research_repository
-    print("\n🔬 Testing jules_research_repository...")
-    result = await request_manager.research_github_repository("https://github.com/facebook/react")
-    if result.success:
-        data = result.data
-        print(f"✅ Repository research successful")
-        print(f"   Repository: {data['repository']['full_name']}")
-        print(f"   Stars: {data['repository']['stargazers_count']}")
-        print(f"   Patterns: {data['implementation_patterns']}")
-    else:
-        print(f"❌ Repository research failed: {result.error}")
 
-    # Test 2: jules_search_best_practices
-    print("\n💡 Testing jules_search_best_practices...")
-    result = await request_manager.search_best_practices("React hooks patterns")
-    if result.success:
-        data = result.data
-        print(f"✅ Best practices search successful")
-        print(f"   Total results: {data['total_results']}")
-        print(f"   Code examples: {len(data['code_examples'])}")
-        if data['recommended']:
-            print(f"   First recommendation: {data['recommended'][0]['title']}")
-    else:
-        print(f"❌ Best practices search failed: {result.error}")
+async def test_mcp_tools(request_manager):
+    """Test all MCP tools that don't require Jules sessions"""
 
-    # Test 3: jules_validate_dependencies
-    print("\n🔗 Testing jules_validate_dependencies...")
     dependencies = [
         {
             "type": "github_repo",
@@ -67,77 +47,50 @@ async def test_mcp_tools():
             "url": "https://httpbin.org/status/200"
         }
     ]
-    result = await request_manager.validate_external_dependencies(dependencies)
-    if result.success:
-        data = result.data
-        print(f"✅ Dependency validation successful")
-        print(f"   Total: {data['total_dependencies']}")
-        print(f"   Available: {data['available']}")
-        print(f"   Failed: {data['failed']}")
-    else:
-        print(f"❌ Dependency validation failed: {result.error}")
 
-async def test_jules_api_connectivity():
-    """Test Jules API connectivity"""
-    print("\n🤖 Testing Jules API Connectivity...")
+    # The three tools hit independent services, so start them all up front
+    research = asyncio.create_task(
+        request_manager.research_github_repository("https://github.com/facebook/react")
+    )
+    practices = asyncio.create_task(request_manager.search_best_practices("React hooks patterns"))
+    validation = asyncio.create_task(request_manager.validate_external_dependencies(dependencies))
+    research_result, practices_result, validation_result = await asyncio.gather(
+        research, practices, validation
+    )
 
-    try:
-        from jules_mcp.jules_client import JulesAPIClient
+    # Test 1: jules_research_repository
+    result = research_result
+    if not result.success and result.status is None:
+        pytest.skip(f"GitHub unavailable: {result.error}")
+    assert result.success, result.error
+    assert result.data['repository']['full_name'] == "facebook/react"
+
+    # Test 2: jules_search_best_practices
+    result = practices_result
+    if not result.success and result.status is None:
+        pytest.skip(f"Web search unavailable: {result.error}")
+    assert result.success, result.error
+    assert result.data['recommended'] == result.data['code_examples'][:3]
 
-        client = JulesAPIClient(
-            api_key=os.environ['JULES_API_KEY'],
-            base_url=os.environ['JULES_API_BASE_URL'],
-            api_version=os.environ['JULES_API_VERSION']
-        )
+    # Test 3: jules_validate_dependencies
+    result = validation_result
+    assert result.success, result.error
+    assert result.data['total_dependencies'] == 2
+    assert result.data['available'] + result.data['failed'] == 2
 
-        print(f"✅ Jules API client initialized")
-        print(f"   API Key: {os.environ['JULES_API_KEY'][:20]}...")
-        print(f"   Base URL: {client.base_url}")
+async def test_jules_api_connectivity():
+    """Test Jules API connectivity"""
+    from jules_mcp.jules_client import JulesAPIClient
 
-        # We can't create a real session without a proper GitHub source setup
-        # But we can verify the client was created successfully
-        print(f"✅ Jules API connectivity check passed")
+    client = JulesAPIClient(
+        api_key=os.environ['JULES_API_KEY'],
+        base_url=os.environ['JULES_API_BASE_URL'],
+        api_version=os.environ['JULES_API_VERSION']
+    )
 
+    # We can't create a real session without a proper GitHub source setup
+    # But we can verify the client was created successfully
+    try:
+        assert client.base_url == "https://jules.googleapis.com/v1alpha"
+    finally:
         await client.close()
-        return True
-
-    except Exception as e:
-        print(f"❌ Jules API connectivity failed: {e}")
-        return False
-
-async def main():
-    """Main test runner"""
-    print("🚀 MCP Server Tool Tests")
-    print("=" * 60)
-
-    # Test Request Pattern tools
-    await test_mcp_tools()
-
-    # Test Jules API
-    jules_success = await test_jules_api_connectivity()
-
-    print("\n" + "=" * 60)
-    print("📊 TEST SUMMARY")
-    print("=" * 60)
-    print("✅ Request Pattern Tools: All working")
-    print(f"{'✅' if jules_success else '❌'} Jules API Integration: {'Connected' if jules_success else 'Failed'}")
-
-    if jules_success:
-        print("\n🎉 SUCCESS! Enhanced Jules MCP server is ready!")
-        print("\nAvailable MCP Tools:")
-        print("  📝 jules_create_worker - Create Jules AI workers")
-        print("  💬 jules_send_message - Send messages to workers")
-        print("  ✅ jules_approve_plan - Approve worker plans")
-        print("  🔍 jules_research_repository - Research GitHub repos")
-        print("  💡 jules_search_best_practices - Search code examples")
-        print("  🔗 jules_validate_dependencies - Validate external services")
-        print("  🎯 jules_generate_with_context - Generate with enhanced context")
-        print("\nAvailable MCP Resources:")
-        print("  👥 workers://all - View all workers")
-        print("  📊 worker://{id}/status - Worker status")
-        print("  📋 worker://{id}/activities - Worker activities")
-    else:
-        print("\n⚠️ Request patterns work, but Jules API has issues")
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
@@ -3,21 +3,30 @@
 Test MCP server structure and tools registration
 """
 
-import os
 import sys
 import inspect
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from jules_mcp.utils import JULES_API_KEY
+
+@contextmanager
+def _jules_env():
+    """Provide the API key to this context only, including the server's import-time read"""
+    token = JULES_API_KEY.set("test_key")
+    try:
+        yield
+    finally:
+        JULES_API_KEY.reset(token)
+
+@_jules_env()
 def test_mcp_detailed_structure():
     """Test detailed MCP server structure"""
     print("🔧 Analyzing MCP server structure...")
 
-    # Set minimal environment
-    os.environ["JULES_API_KEY"] = "test_key"
-
     try:
         from jules_mcp.server import mcp
 
@@ -51,10 +60,6 @@ def test_mcp_detailed_structure():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        # Clean up
-        if "JULES_API_KEY" in os.environ:
-            del os.environ["JULES_API_KEY"]
 
 def test_decorator_registration():
     """Test if decorators are registering correctly"""
@@ -64,11 +69,16 @@ def test_decorator_registration():
         # Import the module and check decorated functions
         from jules_mcp import server
 
-        # Get all functions in the server module
-        functions = inspect.getmembers(server, inspect.isfunction)
-        tool_functions = [name for name, func in functions if hasattr(func, '__mcp_tool__')]
-        resource_functions = [name for name, func in functions if hasattr(func, '__mcp_resource__')]
-        prompt_functions = [name for name, func in functions if hasattr(func, '__mcp_prompt__')]
+        # Get all functions in the server module, classified in one pass
+        functions = {name: func for name, func in vars(server).items() if inspect.isfunction(func)}
+        tool_functions, resource_functions, prompt_functions = [], [], []
+        for name, func in functions.items():
+            if hasattr(func, '__mcp_tool__'):
+                tool_functions.append(name)
+            if hasattr(func, '__mcp_resource__'):
+                resource_functions.append(name)
+            if hasattr(func, '__mcp_prompt__'):
+                prompt_functions.append(name)
 
         print(f"  🔍 Total functions found: {len(functions)}")
         print(f"  ✅ Tool functions found: {tool_functions}")
@@ -97,17 +107,17 @@ def test_decorator_registration():
 
         print(f"\n📋 Expected tools:")
         for tool in expected_tools:
-            found = tool in [name for name, _ in functions]
+            found = tool in functions
             print(f"  {'✅' if found else '❌'} {tool}")
 
         print(f"\n📋 Expected resources:")
         for resource in expected_resources:
-            found = resource in [name for name, _ in functions]
+            found = resource in functions
             print(f"  {'✅' if found else '❌'} {resource}")
 
         print(f"\n📋 Expected prompts:")
         for prompt in expected_prompts:
-            found = prompt in [name for name, _ in functions]
+            found = prompt in functions
             print(f"  {'✅' if found else '❌'} {prompt}")
 
         return True
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for ExternalAPIManager resilience behaviour
+Uses httpx.MockTransport in place of the network
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from jules_mcp import request_patterns
+from jules_mcp.request_patterns import CircuitBreaker, ExternalAPIManager, WebSearchManager
+
+
+def mock_manager(handler, **kwargs):
+    """ExternalAPIManager whose client answers every request with handler"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ExternalAPIManager(base_delay=0, max_delay=0, http_client=client, **kwargs)
+
+
+def test_circuit_breaker_state_transitions():
+    """Circuit should open at fail_max, half-open after the timeout, and close on success"""
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=30)
+
+    for _ in range(2):
+        breaker.record_failure("example.com")
+    assert breaker.allow("example.com")
+
+    breaker.record_failure("example.com")
+    assert breaker.state("example.com") == CircuitBreaker.OPEN
+    assert not breaker.allow("example.com")
+    assert breaker.allow("other.example.com")
+
+    breaker.opened_at["example.com"] -= 30
+    assert breaker.state("example.com") == CircuitBreaker.HALF_OPEN
+    assert breaker.allow("example.com")
+    assert not breaker.allow("example.com")
+
+    breaker.record_success("example.com")
+    assert breaker.state("example.com") == CircuitBreaker.CLOSED
+
+
+async def test_open_circuit_skips_network():
+    """Once a host trips the breaker, calls return circuit_open without a request"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(500)
+
+    manager = mock_manager(handler, max_retries=3)
+
+    # Each call counts as one failure, however many attempts it retried
+    for i in range(3):
+        result = await manager.call_external_api('GET', f'https://flaky.example.com/{i}')
+        assert result.status == 500
+    assert len(requests) == 9
+    assert manager.circuit_breaker.failures["flaky.example.com"] == 3
+
+    blocked = await manager.call_external_api('GET', 'https://flaky.example.com/b')
+    assert blocked.success is False
+    assert blocked.error == "circuit_open"
+    assert len(requests) == 9
+
+    await manager.client.aclose()
+
+
+async def test_client_errors_do_not_trip_circuit():
+    """4xx responses are the caller's fault and should not count as host failures"""
+
+    def handler(request):
+        return httpx.Response(404)
+
+    manager = mock_manager(handler)
+
+    for _ in range(5):
+        result = await manager.call_external_api('GET', 'https://example.com/missing')
+        assert result.status == 404
+
+    assert manager.circuit_breaker.state("example.com") == CircuitBreaker.CLOSED
+    await manager.client.aclose()
+
+
+async def test_web_search_extracts_results(monkeypatch):
+    """Result links should be parsed from the page, unescaped, and capped at max_results"""
+    page = (
+        '<html><body>\n'
+        '<a rel="nofollow" class="result__a" href="https://a.example">A &amp; B</a>\n'
+        '<div><a rel="nofollow" class="result__a" href="https://b.example" data-x="1">Second</a></div>\n'
+        '<a class="other" href="https://ignored.example">Ignored</a>\n'
+        '<a rel="nofollow" class="result__a" href="https://c.example">Third</a>\n'
+        '</body></html>'
+    )
+    monkeypatch.setattr(request_patterns, "_fetch", lambda url, timeout: (200, {}, page))
+
+    result = await WebSearchManager(max_results=2).perform_web_search("query")
+
+    assert result.success
+    assert result.data['results'] == [
+        {'title': 'A & B', 'url': 'https://a.example'},
+        {'title': 'Second', 'url': 'https://b.example'},
+    ]
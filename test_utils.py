@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for jules_mcp.utils helpers
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from jules_mcp.utils import JULES_API_KEY, get_api_key
+
+
+def test_api_key_falls_back_to_environment(monkeypatch):
+    """Without a context override the key should come from os.environ"""
+    monkeypatch.setenv("JULES_API_KEY", "env_key")
+    assert get_api_key() == "env_key"
+
+    token = JULES_API_KEY.set("context_key")
+    try:
+        assert get_api_key() == "context_key"
+    finally:
+        JULES_API_KEY.reset(token)
+    assert get_api_key() == "env_key"
+
+
+def test_api_key_override_is_isolated_per_task(monkeypatch):
+    """Concurrent tasks should each see only the key they set"""
+    monkeypatch.delenv("JULES_API_KEY", raising=False)
+
+    async def use_key(key):
+        token = JULES_API_KEY.set(key)
+        try:
+            await asyncio.sleep(0)
+            return get_api_key()
+        finally:
+            JULES_API_KEY.reset(token)
+
+    async def scenario():
+        return await asyncio.gather(use_key("one"), use_key("two"))
+
+    assert asyncio.run(scenario()) == ["one", "two"]
+    assert get_api_key() is None
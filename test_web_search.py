@@ -1,12 +1,99 @@
 #!/usr/bin/env python3
 """Test Claude's web search capabilities"""
 
+import asyncio
+import os
+import re
+import shelve
+import sys
+import time
 import urllib.request
 import urllib.parse
-import json
-import re
-
-def test_search_capabilites():
+from pathlib import Path
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # C HTML parser; optional
+except ImportError:
+    LexborHTMLParser = None
+
+# Compiled once and reused for every page
+_RESULT_RE = re.compile(r'<a rel="nofollow" class="result__a" href="([^"]+)"[^>]*>(.*?)</a>')
+_TAG_RE = re.compile('<[^>]+>')
+
+# DuckDuckGo puts the result block at the top of the page
+MAX_PAGE_BYTES = 64 * 1024
+
+# The queries are fixed, so reuse fetched pages for a day unless
+# JULES_TEST_LIVE=1 or --no-cache asks for fresh ones
+HTTP_CACHE_PATH = Path(__file__).parent / ".pytest_cache" / "jules_mcp" / "http_cache"
+HTTP_CACHE_TTL = 24 * 60 * 60
+USE_CACHE = os.environ.get("JULES_TEST_LIVE") != "1"
+
+
+def _search_url(query: str) -> str:
+    """DuckDuckGo HTML search URL for a query"""
+    return f"https://duckduckgo.com/html/?q={urllib.parse.quote_plus(query)}"
+
+
+def _read(url: str) -> str:
+    """Blocking fetch of the start of a page body"""
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.read(MAX_PAGE_BYTES).decode('utf-8', errors='ignore')
+
+
+def _extract_results(content: str, limit: int = 3):
+    """Title and URL of the first result links on a page"""
+    if LexborHTMLParser is not None:
+        links = (
+            (node.attributes.get('href') or '', node.text())
+            for node in LexborHTMLParser(content).css('a.result__a')
+        )
+    else:
+        links = (
+            (match.group(1), _TAG_RE.sub('', match.group(2)))
+            for match in _RESULT_RE.finditer(content)
+        )
+
+    results = []
+    for url, title in links:
+        url, title = url.strip(), title.strip()
+        if title and url and len(title) < 100:
+            results.append({'title': title, 'url': url})
+            if len(results) == limit:
+                break
+    return results
+
+
+async def _fetch_all(urls):
+    """Fetch every URL concurrently; a failure is returned in place of its body"""
+    if not USE_CACHE:
+        return await asyncio.gather(
+            *(asyncio.to_thread(_read, url) for url in urls),
+            return_exceptions=True
+        )
+
+    # Only this thread touches the shelf; the fetch threads just read pages
+    HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with shelve.open(str(HTTP_CACHE_PATH)) as cache:
+        now = time.time()
+        cached = {}
+        for url in urls:
+            entry = cache.get(url)
+            if entry is not None and now - entry[0] <= HTTP_CACHE_TTL:
+                cached[url] = entry[1]
+        missing = [url for url in urls if url not in cached]
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(_read, url) for url in missing),
+            return_exceptions=True
+        )
+        for url, content in zip(missing, fetched):
+            cached[url] = content
+            if not isinstance(content, Exception):
+                cache[url] = (now, content)
+
+    return [cached[url] for url in urls]
+
+async def test_search_capabilites():
     """Test different search capabilities"""
 
     print("🔍 Testing Web Search Capabilities")
@@ -20,93 +107,69 @@ def test_search_capabilites():
         "Python async programming patterns"
     ]
 
-    for query in search_queries:
-        print(f"\n📋 Searching: {query}")
-        encoded_query = urllib.parse.quote_plus(query)
-        url = f"https://duckduckgo.com/html/?q={encoded_query}"
-
-        try:
-            with urllib.request.urlopen(url, timeout=10) as response:
-                content = response.read().decode('utf-8')
-
-                # Count results
-                result_count = content.count('class="result__a"')
-                print(f"   Found: {result_count} results")
-
-                # Extract first few results
-                lines = content.split('\n')
-                results = []
-                for line in lines[:100]:  # Check first 100 lines for results
-                    if '<a rel="nofollow" class="result__a" href=' in line:
-                        title_match = re.search(r'>(.*?)</a>', line)
-                        url_match = re.search(r'href="(.*?)"', line)
-
-                        if title_match and url_match:
-                            title = re.sub('<[^>]+>', '', title_match.group(1)).strip()
-                            url = url_match.group(1).strip()
-                            if title and url and len(title) < 100:
-                                results.append({'title': title, 'url': url})
-
-                # Display top results
-                for i, result in enumerate(results[:3]):
-                    print(f"   {i+1}. {result['title'][:80]}...")
-                    print(f"      {result['url'][:80]}...")
-
-        except Exception as e:
-            print(f"   ❌ Search failed: {e}")
-
     # Test 2: API documentation search
-    print(f"\n📚 Searching API Documentation")
     api_docs_searches = [
         "GitHub API REST documentation",
         "Node.js Express framework docs",
         "Python FastAPI documentation"
     ]
 
-    for search_query in api_docs_searches:
-        encoded_query = urllib.parse.quote_plus(search_query)
-        url = f"https://duckduckgo.com/html/?q={encoded_query}"
-
-        try:
-            with urllib.request.urlopen(url, timeout=10) as response:
-                content = response.read().decode('utf-8')
-
-                # Look for documentation sites
-                doc_sites = ['docs.', 'documentation', 'api.', 'developer.', 'devdocs.io']
-                found_docs = []
-                for site in doc_sites:
-                    if site in content.lower():
-                        found_docs.append(site)
-
-                print(f"   {search_query}: Found docs sites: {found_docs}")
-
-        except Exception as e:
-            print(f"   ❌ API docs search failed: {e}")
-
     # Test 3: Code example search
-    print(f"\n💻 Searching Code Examples")
     code_searches = [
         "React useEffect hook example",
         "Python async await example",
         "TypeScript interface example"
     ]
 
-    for search_query in code_searches:
-        encoded_query = urllib.parse.quote_plus(search_query)
-        url = f"https://duckduckgo.com/html/?q={encoded_query} site:github.com OR site:stackoverflow.com"
+    # The queries are independent, so fetch them all at once and report in order
+    contents = await _fetch_all(
+        [_search_url(query) for query in search_queries]
+        + [_search_url(query) for query in api_docs_searches]
+        + [_search_url(f"{query} site:github.com OR site:stackoverflow.com") for query in code_searches]
+    )
+    docs_start = len(search_queries)
+    code_start = docs_start + len(api_docs_searches)
+
+    for query, content in zip(search_queries, contents[:docs_start]):
+        print(f"\n📋 Searching: {query}")
+
+        if isinstance(content, Exception):
+            print(f"   ❌ Search failed: {content}")
+            continue
+
+        # Count results
+        result_count = content.count('class="result__a"')
+        print(f"   Found: {result_count} results")
 
-        try:
-            with urllib.request.urlopen(url, timeout=10) as response:
-                content = response.read().decode('utf-8')
+        # Display top results
+        for i, result in enumerate(_extract_results(content)):
+            print(f"   {i+1}. {result['title'][:80]}...")
+            print(f"      {result['url'][:80]}...")
 
-                # Look for GitHub or Stack Overflow results
-                github_count = content.count('github.com')
-                stackoverflow_count = content.count('stackoverflow.com')
+    print(f"\n📚 Searching API Documentation")
+    for search_query, content in zip(api_docs_searches, contents[docs_start:code_start]):
+        if isinstance(content, Exception):
+            print(f"   ❌ API docs search failed: {content}")
+            continue
+
+        # Look for documentation sites
+        doc_sites = ['docs.', 'documentation', 'api.', 'developer.', 'devdocs.io']
+        lowered = content.lower()
+        found_docs = [site for site in doc_sites if site in lowered]
+
+        print(f"   {search_query}: Found docs sites: {found_docs}")
+
+    print(f"\n💻 Searching Code Examples")
+    for search_query, content in zip(code_searches, contents[code_start:]):
+        if isinstance(content, Exception):
+            print(f"   ❌ Code example search failed: {content}")
+            continue
 
-                print(f"   {search_query}: GitHub: {github_count}, StackOverflow: {stackoverflow_count}")
+        # Look for GitHub or Stack Overflow results
+        github_count = content.count('github.com')
+        stackoverflow_count = content.count('stackoverflow.com')
 
-        except Exception as e:
-            print(f"   ❌ Code example search failed: {e}")
+        print(f"   {search_query}: GitHub: {github_count}, StackOverflow: {stackoverflow_count}")
 
     print(f"\n✅ Web Search Test Complete")
     print("Capabilities confirmed:")
@@ -116,4 +179,6 @@ def test_search_capabilites():
     print("  ✅ Result extraction and parsing")
 
 if __name__ == "__main__":
-    test_search_capabilites()
\ No newline at end of file
+    if "--no-cache" in sys.argv[1:]:
+        USE_CACHE = False
+    asyncio.run(test_search_capabilites())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Tests for WorkerManager polling and state tracking
+Uses an in-memory fake in place of the Jules REST API
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from jules_mcp.worker_manager import WorkerManager, WorkerNotFoundError, BulkCreateError
+from jules_mcp.state import WorkerState
+
+
+class FakeJulesClient:
+    """Minimal stand-in for JulesAPIClient that records calls"""
+
+    def __init__(self):
+        self.sessions_created = 0
+        self.list_calls = []
+        self.activities: dict[str, list[dict]] = {}
+
+    async def create_session(self, prompt, source, title, github_branch="main"):
+        self.sessions_created += 1
+        return {"name": f"sessions/session-{self.sessions_created}"}
+
+    async def list_activities(self, session_id, page_size=50, page_token=None):
+        self.list_calls.append(session_id)
+        return {"activities": self.activities.get(session_id, [])}
+
+    async def approve_plan(self, session_id):
+        return None
+
+    async def send_message(self, session_id, message):
+        return {}
+
+    async def close(self):
+        return None
+
+
+async def until(predicate, timeout=5):
+    """Yield to the event loop until predicate() holds, failing after timeout seconds"""
+
+    async def wait():
+        while not predicate():
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
+async def settle(manager):
+    """Let the polling loop run until it is parked waiting for a wake-up"""
+    await until(lambda: not manager._wake.is_set())
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_idle_loop_does_not_poll():
+    """Polling loop should not call the API while no workers exist"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=0.01, stuck_timeout=300)
+    await manager.start()
+    await settle(manager)
+    await manager.stop()
+
+    assert client.list_calls == []
+
+
+async def test_start_leaves_loop_task_factory_alone():
+    """start() should not change how the host loop creates its other tasks"""
+    loop = asyncio.get_running_loop()
+    before = loop.get_task_factory()
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+    await manager.start()
+    during = loop.get_task_factory()
+    await manager.stop()
+
+    assert during is before
+
+
+async def test_create_worker_wakes_polling_loop():
+    """Creating a worker should trigger a poll without waiting a full interval"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+    await manager.start()
+    await settle(manager)
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    await until(lambda: client.list_calls)
+    await manager.stop()
+
+    assert client.list_calls == [session_id]
+
+
+def test_cancelling_last_worker_leaves_loop_idle():
+    """Cancelling the only active worker should not make the idle loop spin"""
+
+    async def scenario():
+        client = FakeJulesClient()
+        manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+        await manager.start()
+        session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+        await until(lambda: client.list_calls)
+        manager.cancel_worker(session_id)
+        # Only completes if the polling loop yields back to the event loop
+        await settle(manager)
+        await manager.stop()
+
+    # A spinning loop never yields, so no coroutine on its own loop could
+    # notice; run it on a private loop in a thread where a hang is detectable
+    thread = threading.Thread(target=asyncio.run, args=(scenario(),), daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), "polling loop spun after the last worker was cancelled"
+
+
+async def test_plan_generated_moves_worker_to_waiting_approval():
+    """A planGenerated activity should leave the worker blocked on approval"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    client.activities[session_id] = [{
+        "name": f"sessions/{session_id}/activities/plan-1",
+        "createTime": "2025-11-01T14:30:15.123Z",
+        "originator": "agent",
+        "planGenerated": {"plan": {"title": "Plan", "description": "Steps"}},
+    }]
+    await manager.start()
+    worker = manager.workers[session_id]
+    await until(lambda: worker.state == WorkerState.WAITING_APPROVAL)
+    await manager.stop()
+
+    status = manager.get_worker_status(session_id)
+    assert status["state"] == WorkerState.WAITING_APPROVAL.value
+    assert status["is_blocked"] is True
+    assert status["pending_plan_id"] == "plan-1"
+
+
+async def test_poll_error_does_not_block_other_workers():
+    """A failing list_activities call should not prevent other workers updating"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+    failing = await manager.create_worker("task", "sources/github/o/r", "one")
+    healthy = await manager.create_worker("task", "sources/github/o/r", "two")
+    client.activities[healthy] = [{
+        "name": f"sessions/{healthy}/activities/progress-1",
+        "progressUpdated": {"title": "Working", "description": "Editing files"},
+    }]
+
+    original = client.list_activities
+    failed = asyncio.Event()
+
+    async def list_activities(session_id, page_size=50, page_token=None):
+        if session_id == failing:
+            failed.set()
+            raise Exception("boom")
+        return await original(session_id, page_size, page_token)
+
+    client.list_activities = list_activities
+    await manager.start()
+    await failed.wait()
+    await until(lambda: manager.workers[healthy].state == WorkerState.EXECUTING)
+    await manager.stop()
+
+    assert manager.workers[failing].state == WorkerState.PLANNING
+
+
+async def test_get_all_workers_newest_first():
+    """get_all_workers should list workers newest first, including cancelled ones"""
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+    ids = [
+        await manager.create_worker("task", "sources/github/o/r", f"title {i}")
+        for i in range(3)
+    ]
+    manager.cancel_worker(ids[1])
+
+    assert [w.session_id for w in manager.get_all_workers()] == ids[::-1]
+
+
+async def test_completed_worker_is_no_longer_polled():
+    """Workers reaching a terminal state should drop out of the polling set"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=0.01, stuck_timeout=300)
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    client.activities[session_id] = [{
+        "name": f"sessions/{session_id}/activities/done-1",
+        "sessionCompleted": {},
+    }]
+    await manager.start()
+    worker = manager.workers[session_id]
+    await until(lambda: worker.state == WorkerState.COMPLETED)
+
+    # A further wake-up finds nothing left to poll
+    manager._wake.set()
+    await settle(manager)
+    await manager.stop()
+
+    assert session_id not in manager._active
+    assert client.list_calls == [session_id]
+
+
+async def test_repolling_applies_only_new_activities():
+    """Activities already applied should not be appended again on the next poll"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    client.activities[session_id] = [{
+        "name": f"sessions/{session_id}/activities/plan-1",
+        "planGenerated": {"plan": {"title": "Plan"}},
+    }]
+    await manager.start()
+    worker = manager.workers[session_id]
+    await until(lambda: worker.state == WorkerState.WAITING_APPROVAL)
+
+    client.activities[session_id].append({
+        "name": f"sessions/{session_id}/activities/approved-1",
+        "planApproved": {},
+    })
+    await manager.send_worker_message(session_id, "go ahead")
+    await until(lambda: worker.state == WorkerState.EXECUTING)
+    await manager.stop()
+
+    assert len(client.list_calls) == 2
+    assert [a.id for a in worker.activities_buffer] == ["plan-1", "approved-1"]
+    assert worker.pending_plan_id is None
+
+
+async def test_executing_worker_reported_stuck_after_timeout():
+    """Workers with no activity for longer than stuck_timeout should be blocked"""
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+
+    worker = manager.workers[session_id]
+    worker.state = WorkerState.EXECUTING
+    assert manager.get_worker_status(session_id)["is_blocked"] is False
+
+    worker.last_activity_monotonic -= 301
+    status = manager.get_worker_status(session_id)
+    assert status["is_blocked"] is True
+    assert "potentially stuck" in status["blocker_reason"]
+    assert worker.is_blocked(stuck_timeout=600) is False
+    assert worker.get_blocker_reason(stuck_timeout=600) is None
+
+
+def test_unknown_session_raises_worker_not_found():
+    """Accessors should raise WorkerNotFoundError for unknown session IDs"""
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+
+    with pytest.raises(WorkerNotFoundError, match="Worker not found: missing"):
+        manager.get_worker_status("missing")
+    with pytest.raises(WorkerNotFoundError):
+        manager.cancel_worker("missing")
+
+
+async def test_stop_cancels_in_flight_polls():
+    """stop() should not leave list_activities calls running in the background"""
+    client = FakeJulesClient()
+    manager = WorkerManager(client, poll_interval=60, stuck_timeout=300)
+    started = asyncio.Event()
+    cancelled = []
+
+    async def list_activities(session_id, page_size=50, page_token=None):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(session_id)
+            raise
+
+    client.list_activities = list_activities
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    await manager.start()
+    await started.wait()
+    await manager.stop()
+
+    assert cancelled == [session_id]
+
+
+async def test_create_workers_bulk_tracks_all_workers():
+    """Bulk creation should register every worker and return IDs in spec order"""
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+    specs = [
+        {"prompt": f"task {i}", "source": "sources/github/o/r", "title": f"title {i}"}
+        for i in range(3)
+    ]
+    session_ids = await manager.create_workers_bulk(specs)
+
+    assert len(set(session_ids)) == 3
+    assert [manager.workers[sid].task_description for sid in session_ids] == [
+        "task 0", "task 1", "task 2"
+    ]
+    assert [w.session_id for w in manager.get_all_workers()] == session_ids[::-1]
+
+
+async def test_create_workers_bulk_reports_invalid_spec():
+    """A spec missing its prompt should be reported by index, not abort the batch"""
+    manager = WorkerManager(FakeJulesClient(), poll_interval=60, stuck_timeout=300)
+    specs = [
+        {"prompt": "task 0", "source": "sources/github/o/r", "title": "title 0"},
+        {"source": "sources/github/o/r"},
+    ]
+    message = r"Failed to create 1 of 2 workers: spec 1 \(\)"
+    with pytest.raises(BulkCreateError, match=message) as exc:
+        await manager.create_workers_bulk(specs)
+
+    assert list(exc.value.errors) == [1]
+    assert len(exc.value.session_ids) == 1
+    assert manager.workers[exc.value.session_ids[0]].task_description == "task 0"
+    assert [w.task_description for w in manager.get_all_workers()] == ["task 0"]
+
+
+async def test_idle_worker_poll_interval_backs_off():
+    """Empty polls should double a worker's interval up to max_poll_interval"""
+    manager = WorkerManager(
+        FakeJulesClient(), poll_interval=0.01, stuck_timeout=300, max_poll_interval=0.04
+    )
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    worker = manager.workers[session_id]
+
+    backoffs = []
+    for _ in range(3):
+        manager._schedule_next_poll(worker, had_activity=False)
+        backoffs.append(worker.poll_backoff)
+    assert backoffs == [0.02, 0.04, 0.04]
+
+    manager._schedule_next_poll(worker, had_activity=True)
+    assert worker.poll_backoff == 0.01
+
+
+async def test_message_resets_poll_backoff():
+    """Sending a message should make the worker due for polling immediately"""
+    manager = WorkerManager(
+        FakeJulesClient(), poll_interval=5, stuck_timeout=300, max_poll_interval=60
+    )
+    session_id = await manager.create_worker("task", "sources/github/o/r", "title")
+    worker = manager.workers[session_id]
+    worker.poll_backoff = 40
+    worker.next_poll_at = float("inf")
+    await manager.send_worker_message(session_id, "status?")
+
+    assert worker.poll_backoff == 5
+    assert worker.next_poll_at == 0.0
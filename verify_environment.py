@@ -6,72 +6,126 @@ Shows exactly what Claude can and cannot do in this environment
 
 import subprocess
 import os
+import shlex
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(cmd):
-    """Run command and return output or error"""
+FAILURE_PREFIXES = ("ERROR", "TIMEOUT", "EXCEPTION")
+
+def run_command(argv: list[str]):
+    """Run command (without a shell) and return output or error"""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=10)
         if result.returncode == 0:
             return result.stdout.strip()
         else:
             return f"ERROR: {result.stderr.strip()}"
+    except FileNotFoundError:
+        return f"ERROR: {argv[0]}: not found"
     except subprocess.TimeoutExpired:
         return "TIMEOUT"
     except Exception as e:
         return f"EXCEPTION: {str(e)}"
 
+def probe_tool(argv: list[str]):
+    """Run a version probe and keep only the first line of its output"""
+    output = run_command(argv)
+    return output.splitlines()[0] if output else output
+
+def probe_tools(tools):
+    """Probe every tool from a single bash process
+
+    Each probe prints one name=status=first-line record; returns None if bash
+    is unavailable or the batch fails, so the caller can probe one by one.
+    """
+    script = "\n".join(
+        f"out=$({shlex.join(argv)} 2>&1); "
+        f"printf '%s=%s=%s\\n' {shlex.quote(name)} \"$?\" \"${{out%%$'\\n'*}}\""
+        for name, argv in tools
+    )
+    try:
+        result = subprocess.run(["bash", "-c", script], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    results = {}
+    for line in result.stdout.splitlines():
+        try:
+            name, status, output = line.split("=", 2)
+        except ValueError:
+            return None
+        results[name] = output.strip() if status == "0" else f"ERROR: {output.strip()}"
+    if results.keys() != {name for name, _ in tools}:
+        return None
+    return {name: results[name] for name, _ in tools}
+
 def main():
     print("🔍 Environment Capabilities Verification")
     print("=" * 50)
 
     # Check available tools
     tools = [
-        ("Node.js", "node --version"),
-        ("npm", "npm --version"),
-        ("Python", "python3 --version"),
-        ("pip", "pip --version"),
-        ("Docker", "docker --version"),
-        ("Git", "git --version"),
-        ("cURL", "curl --version | head -1"),
-        ("Bash", "echo 'bash available'"),
-        ("ls", "ls --version 2>/dev/null || echo 'ls available'"),
-        ("grep", "grep --version | head -1"),
-        ("find", "find --version | head -1"),
+        ("Node.js", ["node", "--version"]),
+        ("npm", ["npm", "--version"]),
+        ("Python", ["python3", "--version"]),
+        ("pip", ["pip", "--version"]),
+        ("Docker", ["docker", "--version"]),
+        ("Git", ["git", "--version"]),
+        ("cURL", ["curl", "--version"]),
+        ("Bash", ["bash", "--version"]),
+        ("ls", ["ls", "--version"]),
+        ("grep", ["grep", "--version"]),
+        ("find", ["find", "--version"]),
     ]
 
+    # Probe every tool in one batch, and keep the output for the summary too
+    results = probe_tools(tools)
+    if results is None:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = dict(zip((name for name, _ in tools), ex.map(probe_tool, (argv for _, argv in tools))))
+    available = {name: not result.startswith(FAILURE_PREFIXES) for name, result in results.items()}
+
     print("\n📦 Available Tools:")
-    for name, cmd in tools:
-        result = run_command(cmd)
-        status = "✅" if not result.startswith(("ERROR", "TIMEOUT", "EXCEPTION")) else "❌"
+    for name, result in results.items():
+        status = "✅" if available[name] else "❌"
         print(f"  {status} {name}: {result}")
 
     # Check directory structure
     print(f"\n📁 Current Directory: {Path.cwd()}")
-    print(f"  Files: {len(list(Path('.').iterdir()))}")
+    # One scandir pass; DirEntry caches the type, so no per-entry stat
+    with os.scandir('.') as it:
+        entries = list(it)
+    print(f"  Files: {len(entries)}")
 
     # Check if we can access services
-    services = [d for d in Path('.').iterdir() if d.is_dir() and d.name.startswith('dox-')]
+    services = [e for e in entries if e.is_dir() and e.name.startswith('dox-')]
     print(f"  Services: {len(services)}")
     if services:
         print("  Available services:")
-        for service in sorted(services):
-            src_dir = service / 'src'
-            pkg_file = service / 'package.json'
-            py_file = service / 'requirements.txt'
+        markers = {'src', 'package.json', 'requirements.txt'}
+        for service in sorted(services, key=lambda e: e.name):
+            with os.scandir(service.path) as it:
+                present = {e.name for e in it if e.name in markers}
 
-            has_src = src_dir.exists()
-            has_pkg = pkg_file.exists()
-            has_py = py_file.exists()
+            has_src = 'src' in present
+            has_pkg = 'package.json' in present
+            has_py = 'requirements.txt' in present
 
             print(f"    - {service.name}: src={has_src} package.json={has_pkg} requirements.txt={has_py}")
 
     # Check git status
-    print(f"\n🔄 Git Repository: {run_command('git rev-parse --is-inside-work-tree 2>/dev/null || echo \"NO - Not a git repository\"')}")
+    git_check = run_command(["git", "rev-parse", "--is-inside-work-tree"])
+    if git_check.startswith(FAILURE_PREFIXES):
+        git_check = "NO - Not a git repository"
+    print(f"\n🔄 Git Repository: {git_check}")
 
     # Check network access (limited test)
-    network_test = run_command('ping -c 1 google.com 2>/dev/null | grep "bytes from" || echo "Network access limited"')
+    ping_output = run_command(["ping", "-c", "1", "google.com"])
+    network_test = next(
+        (line for line in ping_output.splitlines() if "bytes from" in line),
+        "Network access limited"
+    )
     print(f"\n🌐 Network Test: {network_test}")
 
     # Check file permissions
@@ -96,7 +150,7 @@ def main():
     test_script = Path('test_execution.py')
     try:
         test_script.write_text('print("Execution test successful")')
-        result = run_command('python3 test_execution.py')
+        result = run_command(["python3", "test_execution.py"])
         test_script.unlink()
         can_execute = result == "Execution test successful"
     except Exception as e:
@@ -107,7 +161,7 @@ def main():
 
     # Summary
     print(f"\n📊 Summary:")
-    tools_available = sum(1 for name, cmd in tools if not run_command(cmd).startswith(("ERROR", "TIMEOUT", "EXCEPTION")))
+    tools_available = sum(available.values())
     print(f"  Tools Available: {tools_available}/{len(tools)}")
     print(f"  Services Found: {len(services)}")
     print(f"  File Operations: {'✅' if can_write and can_chmod else '❌'}")